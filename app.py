@@ -1,14 +1,20 @@
 import streamlit as st
 
-from hw2.showing_data import render_hw2
-from hw3.hypercube import render_hw3
-from hw4.human_impact import render_hw4
+import assets
+import perf
+from views import VIEWS, load_view
 
 st.set_page_config(
     page_title="CPSC 481 Data Analysis and Communication",
     layout="wide",
 )
 
+try:
+    assets.check_vendored()
+except (OSError, ValueError) as exc:
+    st.error(f"Chart libraries unavailable: {exc}")
+    st.stop()
+
 st.markdown(
     """
     <style>
@@ -79,10 +85,10 @@ if st.button("Open Human Impact", use_container_width=True):
 
 st.divider()
 
+perf.attach_panel(st.sidebar.empty() if perf.debug_enabled() else None)
+
 selected_hw = st.session_state.selected_hw
-if selected_hw == "Showing Data":
-    render_hw2()
-elif selected_hw == "Interactive Hypercube":
-    render_hw3()
-elif selected_hw == "Human Impact":
-    render_hw4()
+# Every render_* function is an st.fragment: its widgets rerun only the view,
+# not the cards above.
+if selected_hw in VIEWS:
+    load_view(selected_hw)()
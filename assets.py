@@ -0,0 +1,92 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+
+import streamlit.components.v1 as components
+
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vendor")
+MANIFEST_PATH = os.path.join(VENDOR_DIR, "manifest.json")
+
+# Pinned chart libraries: name -> upstream URL. vendor_assets.py copies them
+# into VENDOR_DIR under content-hashed file names recorded in the manifest.
+LIBRARIES = {
+    "d3": "https://d3js.org/d3.v7.min.js",
+    "three": "https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js",
+}
+
+# Vendoring is part of every build: a library missing from the manifest is
+# an error, and app.py checks them all at startup. Only with VIZ_CDN=1
+# (development checkouts) are missing libraries loaded from their CDN URLs.
+ALLOW_CDN = os.environ.get("VIZ_CDN") == "1"
+
+logger = logging.getLogger(__name__)
+
+# Declaring the vendor directory as a component makes Streamlit serve it at
+# component/assets.vendor/ with real content types. Streamlit sends non-HTML
+# files there as "Cache-Control: public" with an ETag but no max-age, so
+# browsers keep them and revalidate; it offers no way to set a lifetime. For
+# a long-lived cache, have the proxy in front of the app send
+# "public, max-age=31536000, immutable" for this path, which is safe because
+# every file name carries a hash of its content.
+components.declare_component("vendor", path=VENDOR_DIR)
+VENDOR_URL = "component/assets.vendor"
+
+
+@functools.lru_cache(maxsize=None)
+def _manifest() -> dict[str, str]:
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def hashed_name(url: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(os.path.basename(url))
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{stem}.{digest}{ext}"
+
+
+@functools.lru_cache(maxsize=None)
+def check_vendored() -> None:
+    """Fail unless every library is vendored with the content its name hashes.
+
+    Cached once it passes, so app.py can call it on every run.
+    """
+    manifest = _manifest()
+    missing = [name for name in LIBRARIES if name not in manifest]
+    if missing and not ALLOW_CDN:
+        raise FileNotFoundError(
+            f"{', '.join(missing)} not vendored; run vendor_assets.py "
+            "(or set VIZ_CDN=1 in a development checkout)"
+        )
+    for name, file_name in manifest.items():
+        path = os.path.join(VENDOR_DIR, file_name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{name} is in the manifest but {path} is missing")
+        with open(path, "rb") as f:
+            if hashed_name(LIBRARIES[name], f.read()) != file_name:
+                raise ValueError(f"{path} does not match its hash; rerun vendor_assets.py")
+
+
+def asset_url(name: str) -> str:
+    file_name = _manifest().get(name)
+    if file_name is None:
+        if not ALLOW_CDN:
+            raise FileNotFoundError(f"{name} is not vendored; run vendor_assets.py")
+        _warn_cdn(name)
+        return LIBRARIES[name]
+    # Relative on purpose: srcdoc iframes resolve it against the app's URL,
+    # which keeps it working under a server.baseUrlPath.
+    return f"{VENDOR_URL}/{file_name}"
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_cdn(name: str) -> None:
+    logger.warning("%s is not vendored; loading it from %s", name, LIBRARIES[name])
+
+
+def script_tag(name: str, defer: bool = False) -> str:
+    # A deferred tag does not hold up parsing and painting the page below it.
+    return f'<script src="{asset_url(name)}"{" defer" if defer else ""}></script>'
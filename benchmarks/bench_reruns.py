@@ -0,0 +1,192 @@
+"""Headless rerun-latency benchmark for the three homework views.
+
+Drives app.py with Streamlit's AppTest and records, per scenario, the p50/p95
+script-run latency and the size of the HTML/JSON the runs send to the browser:
+once for the first run, which ships everything, and once for a repeated
+rerun, which may only ship what changed (hw2's chart then sends keys alone).
+
+Usage:
+    python benchmarks/bench_reruns.py [--repeats 20] [--output bench_reruns.json]
+                                      [--baseline old.json] [--tolerance 1.25]
+
+With --baseline, exits non-zero when any scenario's p95 grew by more than the
+tolerance factor.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# (scenario name, view, [(widget kind, label, value), ...])
+SCENARIOS: list[tuple[str, str, list[tuple[str, str, Any]]]] = [
+    ("hw2-default", "Showing Data", []),
+    ("hw2-max-points-3000", "Showing Data", [("slider", "Max points", 3000)]),
+    (
+        "hw2-all-votes-3000",
+        "Showing Data",
+        [("slider", "Minimum vote count", 0), ("slider", "Max points", 3000)],
+    ),
+    ("hw2-year-bins-10", "Showing Data", [("selectbox", "Year grouping", 10)]),
+    ("hw2-density", "Showing Data", [("radio", "Display", "Density")]),
+]
+for _mode in ["Depth (W-axis)", "Solid", "Edge rainbow"]:
+    SCENARIOS.append(
+        (
+            f"hw3-{_mode.split()[0].lower()}",
+            "Interactive Hypercube",
+            [("selectbox", "Color mode", _mode)],
+        )
+    )
+for _metric in ["Total impact", "Military burden", "Civilian burden"]:
+    for _pct in [False, True]:
+        SCENARIOS.append(
+            (
+                f"hw4-{_metric.split()[0].lower()}{'-pct' if _pct else ''}",
+                "Human Impact",
+                [("selectbox", "Focus metric", _metric), ("checkbox", "% of population", _pct)],
+            )
+        )
+
+
+def _find_widget(at: AppTest, kind: str, label: str) -> Any:
+    for widget in getattr(at, kind):
+        if widget.label.startswith(label):
+            return widget
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def _payload_bytes(at: AppTest) -> int:
+    total = 0
+    for element in at.get("iframe"):
+        total += len(element.proto.srcdoc.encode("utf-8"))
+    for element in at.get("component_instance"):
+        total += len(element.proto.json_args.encode("utf-8"))
+        for arg in element.proto.special_args:
+            total += len(arg.bytes)
+    return total
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def run_scenario(
+    view: str, settings: list[tuple[str, str, Any]], repeats: int, timeout: float
+) -> dict[str, Any]:
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.session_state["selected_hw"] = view
+
+    start = time.perf_counter()
+    at.run()
+    first_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    first_payload = _payload_bytes(at)
+
+    for kind, label, value in settings:
+        _find_widget(at, kind, label).set_value(value)
+    at.run()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+    return {
+        "view": view,
+        "settings": {label: value for _, label, value in settings},
+        "first_run_ms": round(first_ms, 2),
+        "first_payload_bytes": first_payload,
+        "p50_ms": round(_percentile(timings, 0.5), 2),
+        "p95_ms": round(_percentile(timings, 0.95), 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "payload_bytes": _payload_bytes(at),
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * tolerance:
+            regressions.append(
+                f"{name}: p95 {previous['p95_ms']:.1f} -> {current['p95_ms']:.1f} ms"
+            )
+        for key, what in [("first_payload_bytes", "first payload"), ("payload_bytes", "payload")]:
+            if key not in previous:
+                # Baselines from before first payloads were recorded.
+                continue
+            if current[key] > previous[key] * tolerance:
+                regressions.append(
+                    f"{name}: {what} {previous[key]:,} -> {current[key]:,} bytes"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--only", default="", help="Run scenarios whose name starts with this.")
+    parser.add_argument("--output", default="bench_reruns.json")
+    parser.add_argument("--baseline", default="")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    # The app imports its views relative to the repo root and reads the
+    # dataset from the working directory.
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "repeats": args.repeats,
+        "scenarios": {},
+    }
+    for name, view, settings in SCENARIOS:
+        if not name.startswith(args.only):
+            continue
+        row = run_scenario(view, settings, args.repeats, args.timeout)
+        results["scenarios"][name] = row
+        print(
+            f"{name:<24} p50 {row['p50_ms']:>8.1f} ms  p95 {row['p95_ms']:>8.1f} ms  "
+            f"payload {row['first_payload_bytes']:>10,} / {row['payload_bytes']:>10,} B"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"Saved {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Scale benchmark for the hw2 data pipeline on synthetic TMDB-shaped data.
+
+For each size, generates (or reuses) a synthetic source CSV with
+synth_movies.py. It then times every stage a hw2 rerun depends on, without
+Streamlit: the Parquet cache build, loading, the vote index, the top-N
+query, bin labelling, row selection, payload encoding, and the density,
+rollup, skyline and search structures. Each stage reports its median wall
+time and its peak Python heap growth, measured with tracemalloc in a
+separate run; the cache build's memory run writes to a scratch directory,
+leaving the timed build's cache in place. Arrow buffers are not seen by
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_scale.py [--sizes 10k,100k,1m] [--repeats 3]
+                                     [--workdir .cache/bench] [--output bench_scale.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.synth_movies import FIRST_YEAR, LAST_YEAR, parse_size, write  # noqa: E402
+from hw2 import dataset  # noqa: E402
+from hw2.density import hexbin  # noqa: E402
+from hw2.index import MovieIndex  # noqa: E402
+from hw2.payload import encode_rows  # noqa: E402
+from hw2.rollup import YearRollup  # noqa: E402
+from hw2.search import SearchIndex  # noqa: E402
+from hw2.skyline import skyline_layers  # noqa: E402
+
+# The view's default filter: every year, at least 1000 votes, 1200 points.
+YEAR_RANGE = (FIRST_YEAR, LAST_YEAR)
+MIN_VOTES = 1000
+MAX_POINTS = 1200
+BIN_SIZE = 5
+
+
+def measure(
+    fn: Callable[[], Any], repeats: int, memory_fn: Callable[[], Any] | None
+) -> tuple[Any, dict[str, float]]:
+    """Median time of ``fn``, and the peak heap growth of ``memory_fn`` if given."""
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    row = {"ms": round(statistics.median(times), 3)}
+    if memory_fn is not None:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+        memory_fn()
+        row["peak_mb"] = round((tracemalloc.get_traced_memory()[1] - base) / 2**20, 2)
+        tracemalloc.stop()
+    return result, row
+
+
+def run_size(label: str, workdir: str, repeats: int, memory: bool) -> dict[str, Any]:
+    rows = parse_size(label)
+    source_dir = os.path.join(workdir, label)
+    source = os.path.join(source_dir, dataset.SOURCE_NAME)
+    if not os.path.exists(source):
+        print(f"  generating {rows:,} rows ...", flush=True)
+        write(source, rows)
+    cache_dir = os.path.join(source_dir, "cache")
+    dataset.CACHE_DIR = cache_dir
+
+    stages: dict[str, dict[str, float]] = {}
+
+    def stage(
+        name: str,
+        fn: Callable[[], Any],
+        times: int = repeats,
+        memory_fn: Callable[[], Any] | None = None,
+    ) -> Any:
+        """Run ``fn`` as a stage; its memory run uses ``memory_fn`` instead if given."""
+        result, stages[name] = measure(fn, times, (memory_fn or fn) if memory else None)
+        print(f"  {name:<14} {stages[name]['ms']:>10.1f} ms", flush=True)
+        return result
+
+    def build_scratch() -> None:
+        with tempfile.TemporaryDirectory(dir=source_dir) as scratch:
+            dataset.CACHE_DIR = scratch
+            try:
+                dataset.build_cache(source)
+            finally:
+                dataset.CACHE_DIR = cache_dir
+
+    cached = stage(
+        "build_cache", lambda: dataset.build_cache(source), times=1, memory_fn=build_scratch
+    )
+    df = stage("load", lambda: dataset.freeze(dataset.read_cache(cached)))
+    index = stage("index", lambda: MovieIndex(df))
+    positions, matched = stage("query", lambda: index.query(YEAR_RANGE, MIN_VOTES, MAX_POINTS))
+    everything = stage("matches", lambda: index.matches(YEAR_RANGE, MIN_VOTES))
+    labels = stage("bin_labels", lambda: index.bin_labels(BIN_SIZE, positions))
+
+    def take() -> pd.DataFrame:
+        frame = df.take(positions)
+        frame["year_bin_label"] = labels
+        return frame
+
+    frame = stage("take", take)
+    encoder = stage("encode", lambda: encode_rows(frame.index.to_numpy(), frame))
+    stage(
+        "density",
+        lambda: hexbin(df, everything, index.bin_labels(BIN_SIZE, everything)),
+    )
+    rollup = stage("rollup_build", lambda: YearRollup(df), times=1)
+    stage("rollup_query", lambda: rollup.summary(YEAR_RANGE, MIN_VOTES, BIN_SIZE))
+    stage(
+        "skyline",
+        lambda: skyline_layers(
+            df["vote_average"].to_numpy()[everything],
+            df["popularity"].to_numpy()[everything],
+            3,
+        ),
+    )
+    search = stage("search_build", lambda: SearchIndex(df), times=1)
+    stage("search_query", lambda: search.search("the silent", index.ranks, limit=50))
+
+    return {
+        "rows": len(df),
+        "matched": int(matched),
+        "payload_bytes": encoder.payload_bytes(),
+        "stages": stages,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k,1m", help="Comma-separated, e.g. 10k,1m,10m.")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workdir", default=os.path.join(ROOT, ".cache", "bench"))
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs.")
+    parser.add_argument("--output", default="bench_scale.json")
+    args = parser.parse_args()
+
+    results: dict[str, Any] = {
+        "python": platform.python_version(),
+        "repeats": args.repeats,
+        "sizes": {},
+    }
+    for label in args.sizes.split(","):
+        print(f"{label}:", flush=True)
+        results["sizes"][label] = run_size(label, args.workdir, args.repeats, not args.no_memory)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"Saved {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Write a synthetic, TMDB-shaped movie table for scale testing.
+
+The output has the columns of the Kaggle top-rated export (a leading
+unnamed index, id, title, overview, release_date, popularity, vote_average,
+vote_count). Its distributions are skewed like the real data:
+- vote_count and popularity are heavy-tailed and correlated;
+- release dates cluster in recent years and in the autumn season;
+- overviews run to dozens of Zipf-distributed words.
+Rows are generated in chunks, each chunk from its own seeded stream. The
+output is therefore deterministic for a given seed and row count, and memory
+stays flat up to tens of millions of rows.
+
+Usage:
+    python benchmarks/synth_movies.py 1m [--seed 0] [--format csv|parquet]
+                                         [--output top_rated_movies.csv]
+"""
+
+import argparse
+import os
+import sys
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 100_000
+FIRST_YEAR = 1990
+LAST_YEAR = 2025
+
+_ADJECTIVES = (
+    "Silent Last Broken Golden Hidden Lost Eternal Crimson Wild Distant Frozen "
+    "Secret Burning Quiet Endless Fallen Bright Hollow Savage Gentle"
+).split()
+_NOUNS = (
+    "Night River Empire Garden Shadow Kingdom Storm Promise Journey Memory "
+    "Harbor Machine Winter Letter Island Horizon Voice Mirror Station Summer"
+).split()
+# Overview vocabulary: common words first, then filler terms. Word i is
+# drawn with probability ~ 1 / (i + 1).
+_COMMON = (
+    "a the of and to in his her their story young man woman family life world "
+    "love war city must find new only two years after when who one home secret "
+    "past friends journey town father mother night dark"
+).split()
+_VOCABULARY = np.array(_COMMON + [f"term{i}" for i in range(5000 - len(_COMMON))], dtype=object)
+
+
+def parse_size(text: str) -> int:
+    """'10k', '1m', '2.5M' or a plain integer."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def generate(rows: int, seed: int = 0) -> Iterator[pd.DataFrame]:
+    """Yield the table in CHUNK_ROWS-row chunks, indexed by global row number."""
+    zipf = 1.0 / np.arange(1, len(_VOCABULARY) + 1)
+    zipf /= zipf.sum()
+    year_weights = np.exp(0.06 * np.arange(LAST_YEAR - FIRST_YEAR + 1))
+    year_weights /= year_weights.sum()
+    month_weights = np.array([6, 6, 8, 7, 7, 8, 8, 8, 10, 12, 11, 9], dtype=float)
+    month_weights /= month_weights.sum()
+
+    for start in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - start)
+        rng = np.random.default_rng([seed, start // CHUNK_ROWS])
+
+        # Heavy-tailed audience size drives both vote_count and popularity.
+        reach = rng.lognormal(mean=5.0, sigma=1.6, size=n)
+        vote_count = np.minimum(np.floor(reach), 40_000).astype(np.int64)
+        popularity = np.round(reach ** 0.6 * rng.lognormal(0.0, 0.8, size=n) / 8, 3)
+        # Ratings tighten toward ~7 as votes grow.
+        spread = 1.6 / np.log10(vote_count + 10)
+        vote_average = np.round(np.clip(rng.normal(6.9, spread), 1.0, 10.0), 3)
+
+        years = FIRST_YEAR + rng.choice(len(year_weights), size=n, p=year_weights)
+        months = 1 + rng.choice(12, size=n, p=month_weights)
+        days = 1 + rng.integers(0, 28, size=n)
+        release_date = [f"{y:04d}-{m:02d}-{d:02d}" for y, m, d in zip(years, months, days)]
+
+        ids = np.arange(start, start + n)
+        adjectives = rng.choice(len(_ADJECTIVES), size=n)
+        nouns = rng.choice(len(_NOUNS), size=n)
+        title = [
+            f"The {_ADJECTIVES[a]} {_NOUNS[b]}" if i % 7 else f"{_NOUNS[b]} {i}"
+            for i, a, b in zip(ids, adjectives, nouns)
+        ]
+
+        lengths = rng.integers(20, 90, size=n)
+        words = _VOCABULARY[rng.choice(len(_VOCABULARY), size=int(lengths.sum()), p=zipf)]
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+        overview = [
+            " ".join(words[bounds[i] : bounds[i + 1]]).capitalize() + "." for i in range(n)
+        ]
+
+        yield pd.DataFrame(
+            {
+                "id": ids,
+                "title": title,
+                "overview": overview,
+                "release_date": release_date,
+                "popularity": popularity,
+                "vote_average": vote_average,
+                "vote_count": vote_count,
+            },
+            index=pd.RangeIndex(start, start + n),
+        )
+
+
+def write(path: str, rows: int, seed: int = 0, fmt: str = "csv") -> str:
+    """Write ``rows`` synthetic movies to ``path`` atomically; returns the path."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        if fmt == "csv":
+            with open(tmp, "w", encoding="utf-8", newline="") as f:
+                for chunk in generate(rows, seed):
+                    # The Kaggle export carries the frame index as an unnamed
+                    # first column.
+                    chunk.to_csv(f, header=chunk.index[0] == 0, index=True)
+        else:
+            writer = None
+            try:
+                for chunk in generate(rows, seed):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp, table.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", help="Row count, e.g. 10k, 1m, 10m.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args()
+
+    rows = parse_size(args.rows)
+    output = args.output or f"synth_movies_{args.rows}.{args.format}"
+    write(output, rows, args.seed, args.format)
+    print(f"Wrote {rows:,} rows to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Fail when the app's startup imports go over an import-time budget.
+
+Usage:
+    python check_import_budget.py [--budget-ms 2000]
+
+The budget can also be set with the IMPORT_BUDGET_MS environment variable.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# What app.py imports before the first paint.
+STARTUP_IMPORTS = ["streamlit", "perf", "views"]
+
+# View modules must stay lazy; importing any of them at startup is a failure
+# regardless of the measured time.
+LAZY_MODULES = ["hw2.showing_data", "hw3.hypercube", "hw4.human_impact", "kagglehub"]
+
+
+def measure_imports(modules: list[str]) -> tuple[float, set[str]]:
+    root = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    imported: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported.add(name.strip())
+        # Top-level entries have no nesting indent; their cumulative times add
+        # up to the whole import.
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000.0, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("IMPORT_BUDGET_MS", "2000")),
+    )
+    args = parser.parse_args()
+
+    total_ms, imported = measure_imports(STARTUP_IMPORTS)
+    eager = sorted(set(LAZY_MODULES) & imported)
+
+    print(f"Startup import time: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print("Imported eagerly at startup: " + ", ".join(eager))
+    if eager or total_ms > args.budget_ms:
+        print("FAIL")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,10 @@
-import kagglehub
+from hw2.dataset import build_cache, read_stats, source_path
 
-# Download latest version
-path = kagglehub.dataset_download("shraddha4ever20/top-rated-movies-from-tmdb-19902025")
+# Fetch the dataset into HW2_DATA_DIR (verifying HW2_SOURCE_SHA256 when set)
+# and build its Parquet cache, so the app can then run with HW2_OFFLINE=1.
+# Deployments also run vendor_assets.py, without which the app will not start.
+path = source_path()
+stats = read_stats(build_cache(path))
 
-print("Path to dataset files:", path)
\ No newline at end of file
+print("Path to dataset file:", path)
+print(f"Cached {stats['rows']:,} movies ({stats['dropped']:,} incomplete rows dropped)")
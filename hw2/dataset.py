@@ -0,0 +1,544 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from collections.abc import Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATASET = "shraddha4ever20/top-rated-movies-from-tmdb-19902025"
+SOURCE_NAME = "top_rated_movies.csv"
+
+# Where the source CSV lives. With HW2_OFFLINE=1 the app only ever uses the
+# copy found here and never touches the network; run download_data.py at
+# deploy time to fill it. HW2_SOURCE_SHA256 pins the expected file contents;
+# a pinned source is taken to be fixed, so appends to it are not followed
+# (see LiveMovies).
+DATA_DIR = os.environ.get("HW2_DATA_DIR", os.getcwd())
+OFFLINE = os.environ.get("HW2_OFFLINE") == "1"
+EXPECTED_SHA256 = os.environ.get("HW2_SOURCE_SHA256", "").lower()
+
+# Serializes fetching and cache building, so concurrent first loads wait on a
+# single in-flight fetch or parse instead of each starting their own.
+_acquire_lock = threading.Lock()
+_verified: set[str] = set()
+
+# Columnar cache of the parsed source. One Parquet file per source version,
+# named by a fingerprint of the source's path, size and mtime. A version
+# built by appending holds only the appended rows; the files that make up
+# the whole table are listed in its footer (see cache_parts).
+CACHE_DIR = os.environ.get("HW2_CACHE_DIR", os.path.join(os.getcwd(), ".cache", "hw2"))
+# Bump when the cache file layout changes, so older files are rebuilt.
+CACHE_FORMAT = 4
+# Appended parts past this many are merged into one, so a source that grows
+# every day is not read back from hundreds of small files. The first part,
+# the full build, is never rewritten.
+MAX_PARTS = 16
+
+# The source is parsed this many rows at a time, which bounds the cache
+# build's peak memory regardless of the source size.
+CHUNK_ROWS = int(os.environ.get("HW2_CHUNK_ROWS", "250000"))
+# Parquet footer key holding the summary statistics gathered while building.
+STATS_KEY = "hw2_stats"
+# A changed source counts as appended to when it grew and the last
+# TAIL_CHECK_BYTES it had when last parsed are unchanged.
+TAIL_CHECK_BYTES = 1 << 16
+
+# Compact dtypes for the cached frame: years fit in int16, vote counts in
+# int32, and float32 keeps more precision than the two-decimal source values.
+COMPACT_DTYPES = {
+    "release_year": "int16",
+    "vote_count": "int32",
+    "vote_average": "float32",
+    "popularity": "float32",
+    "title": "string[pyarrow]",
+    "overview": "string[pyarrow]",
+}
+# A string column extended by this many appends is merged back into one
+# Arrow chunk (see FrameBuffer).
+MAX_STRING_CHUNKS = 64
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check_sha256(path: str) -> None:
+    actual = file_sha256(path)
+    if actual != EXPECTED_SHA256:
+        raise ValueError(
+            f"{path} has sha256 {actual}, expected {EXPECTED_SHA256} (HW2_SOURCE_SHA256)"
+        )
+
+
+def _verify(path: str) -> None:
+    """Check the pinned checksum once per version of the file."""
+    if not EXPECTED_SHA256:
+        return
+    fingerprint = source_fingerprint(path)
+    if fingerprint not in _verified:
+        _check_sha256(path)
+        _verified.add(fingerprint)
+
+
+def _download(target: str) -> None:
+    import kagglehub
+
+    downloaded = os.path.join(kagglehub.dataset_download(DATASET), SOURCE_NAME)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    shutil.copyfile(downloaded, tmp)
+    if EXPECTED_SHA256:
+        try:
+            _check_sha256(tmp)
+        except ValueError:
+            os.remove(tmp)
+            raise
+    os.replace(tmp, target)
+    if EXPECTED_SHA256:
+        _verified.add(source_fingerprint(target))
+
+
+def source_path() -> str:
+    """Path of the local source CSV, fetching it at most once if missing."""
+    target = os.path.join(DATA_DIR, SOURCE_NAME)
+    if not os.path.exists(target):
+        with _acquire_lock:
+            # Another session may have finished the fetch while we waited.
+            if not os.path.exists(target):
+                if OFFLINE:
+                    raise FileNotFoundError(
+                        f"{target} is missing and HW2_OFFLINE=1 forbids downloading it"
+                    )
+                os.makedirs(DATA_DIR, exist_ok=True)
+                _download(target)
+    _verify(target)
+    return target
+
+
+def source_fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path(path: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(
+        CACHE_DIR, f"{stem}.{source_fingerprint(path)}.v{CACHE_FORMAT}.parquet"
+    )
+
+
+def derived_path(cached: str, name: str) -> str:
+    """Path for a file computed from the cache file ``cached``, such as an
+    index. It sits next to the cache and is pruned with it."""
+    return f"{os.path.splitext(cached)[0]}.{name}"
+
+
+def compact(df: pd.DataFrame) -> pd.DataFrame:
+    dtypes = {col: dtype for col, dtype in COMPACT_DTYPES.items() if col in df.columns}
+    return df.astype(dtypes)
+
+
+def parse_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """Parse dates, drop incomplete rows and compact one slice of the source."""
+    df = df.drop(columns=["Unnamed: 0"], errors="ignore")
+    df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce")
+    df["release_year"] = df["release_date"].dt.year
+    df = df.dropna(
+        subset=["release_year", "popularity", "vote_average", "vote_count", "title"]
+    )
+    return compact(df).reset_index(drop=True)
+
+
+def _add_stats(stats: dict, chunk: pd.DataFrame) -> None:
+    if chunk.empty:
+        return
+    low = int(chunk["release_year"].min())
+    high = int(chunk["release_year"].max())
+    stats["rows"] += len(chunk)
+    stats["year_min"] = low if stats["year_min"] is None else min(stats["year_min"], low)
+    stats["year_max"] = high if stats["year_max"] is None else max(stats["year_max"], high)
+    stats["max_vote_count"] = max(stats["max_vote_count"], int(chunk["vote_count"].max()))
+
+
+class _ByteRange(io.RawIOBase):
+    """Bytes [start, end) of a file, so part of the source can be parsed."""
+
+    def __init__(self, path: str, start: int, end: int) -> None:
+        super().__init__()
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._left = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer)[: min(len(buffer), self._left)]
+        read = self._file.readinto(view) or 0
+        self._left -= read
+        return read
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _complete_end(path: str) -> int:
+    """Offset just past the source's last newline.
+
+    Appends stop there: a row still being written is left for the next
+    refresh rather than parsed half-finished.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - TAIL_CHECK_BYTES)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            pos = start
+    return size
+
+
+def _ends_line(path: str, end: int) -> bool:
+    """Whether the source's first ``end`` bytes end on a line boundary."""
+    if end == 0:
+        return True
+    with open(path, "rb") as f:
+        f.seek(end - 1)
+        return f.read(1) == b"\n"
+
+
+def _tail_digest(path: str, end: int) -> str:
+    start = max(0, end - TAIL_CHECK_BYTES)
+    with open(path, "rb") as f:
+        f.seek(start)
+        return hashlib.sha1(f.read(end - start)).hexdigest()
+
+
+def _read_chunks(
+    path: str, start: int, end: int, names: list[str] | None = None
+) -> Iterator[pd.DataFrame]:
+    """Raw CHUNK_ROWS-row chunks of the source bytes [start, end).
+
+    Without ``names`` the range must begin with the header row.
+    """
+    if start >= end:
+        return
+    options = {} if names is None else {"header": None, "names": names}
+    with io.BufferedReader(_ByteRange(path, start, end)) as stream:
+        with pd.read_csv(stream, chunksize=CHUNK_ROWS, **options) as reader:
+            yield from reader
+
+
+def _write_parquet(
+    tmp: str,
+    chunks: Iterator[pd.DataFrame],
+    stats: dict,
+    empty: pd.DataFrame,
+    schema: pa.Schema | None = None,
+    carried: Sequence[str] = (),
+) -> None:
+    """Write the parsed ``chunks`` to ``tmp``, after the rows of ``carried``.
+
+    ``schema`` is the one the earlier parts of the cache have.
+    """
+    writer = None if schema is None else pq.ParquetWriter(tmp, schema)
+    try:
+        for part in carried:
+            # Merged parts are carried over group by group, unparsed.
+            old = pq.ParquetFile(part)
+            for group in range(old.num_row_groups):
+                writer.write_table(old.read_row_group(group))
+        for raw in chunks:
+            chunk = parse_chunk(raw)
+            stats["dropped"] += len(raw) - len(chunk)
+            if chunk.empty:
+                continue
+            _add_stats(stats, chunk)
+            # Unless the earlier parts fixed it, the first non-empty chunk
+            # fixes the schema; later chunks are converted to it so a column
+            # that happens to be all-missing in one chunk cannot change type.
+            table = pa.Table.from_pandas(
+                chunk, schema=writer.schema if writer else None, preserve_index=False
+            )
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            writer = pq.ParquetWriter(tmp, pa.Schema.from_pandas(empty, preserve_index=False))
+        writer.add_key_value_metadata({STATS_KEY: json.dumps(stats)})
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _replace_cache(path: str, target: str, write, parts: list[str]) -> str:
+    """Write ``target`` through a temp file, then drop older cache versions.
+
+    The files in ``parts``, which hold the rest of the new version's rows,
+    are kept; the files derived from them are not.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, target)
+
+    # Older versions go, along with the files derived from them.
+    stem = os.path.splitext(os.path.basename(path))[0]
+    current = os.path.splitext(os.path.basename(target))[0]
+    for name in os.listdir(CACHE_DIR):
+        if (
+            name.startswith(f"{stem}.")
+            and not name.startswith(f"{current}.")
+            and name not in parts
+            and not name.endswith(".tmp")
+        ):
+            os.remove(os.path.join(CACHE_DIR, name))
+    return target
+
+
+def build_cache(path: str) -> str:
+    """Stream the source into Parquet, replacing older versions.
+
+    The CSV is read CHUNK_ROWS rows at a time and each parsed chunk is
+    appended to the file as its own row group, so only one chunk is ever in
+    memory. Summary statistics are gathered in the same pass and stored in
+    the file's footer (see read_stats), along with how far into the source
+    the parse went, for append_cache, and the list of parts: this file alone.
+
+    The whole file is parsed, a last line without a newline included.
+    """
+    end = os.path.getsize(path)
+    stats = {
+        "rows": 0,
+        "dropped": 0,
+        "year_min": None,
+        "year_max": None,
+        "max_vote_count": 0,
+        # Identifies a build and every append on top of it: rows keep their
+        # positions across appends, not across builds.
+        "lineage": source_fingerprint(path),
+        "source_bytes": end,
+        "source_tail": _tail_digest(path, end),
+    }
+    target = cache_path(path)
+    stats["parts"] = [os.path.basename(target)]
+    empty = parse_chunk(pd.read_csv(path, nrows=0))
+    return _replace_cache(
+        path,
+        target,
+        lambda tmp: _write_parquet(tmp, _read_chunks(path, 0, end), stats, empty),
+        stats["parts"],
+    )
+
+
+def append_cache(path: str, previous: str) -> str | None:
+    """Extend the cache ``previous`` with the rows appended to the source since.
+
+    Only the new bytes are parsed, into a new part that holds just them;
+    the earlier parts stay as they are. Once there are MAX_PARTS parts, the
+    appended ones are merged into the new part, so the work stays
+    proportional to what was appended since the build. Returns None,
+    leaving everything untouched, when the source did not just grow (it
+    shrank, or bytes before the old end changed), or when the previous parse
+    ended inside a line, which the new bytes may continue.
+    """
+    stats = read_stats(previous)
+    start = stats["source_bytes"]
+    end = _complete_end(path)
+    if (
+        end < start
+        or _tail_digest(path, start) != stats["source_tail"]
+        or not _ends_line(path, start)
+    ):
+        return None
+    target = cache_path(path)
+    parts = stats["parts"]
+    carried = []
+    if len(parts) >= MAX_PARTS:
+        carried = [os.path.join(CACHE_DIR, name) for name in parts[1:]]
+        parts = parts[:1]
+    stats.update(
+        source_bytes=end,
+        source_tail=_tail_digest(path, end),
+        parts=[*parts, os.path.basename(target)],
+    )
+    names = list(pd.read_csv(path, nrows=0).columns)
+    empty = parse_chunk(pd.read_csv(path, nrows=0))
+    # Without the old footer, whose stats the new one replaces.
+    schema = pq.read_schema(previous)
+    schema = schema.with_metadata(
+        {key: value for key, value in schema.metadata.items() if key != STATS_KEY.encode()}
+    )
+    return _replace_cache(
+        path,
+        target,
+        lambda tmp: _write_parquet(
+            tmp, _read_chunks(path, start, end, names), stats, empty, schema, carried
+        ),
+        stats["parts"],
+    )
+
+
+def _previous_cache(path: str) -> str | None:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if not os.path.isdir(CACHE_DIR):
+        return None
+    suffix = f".v{CACHE_FORMAT}.parquet"
+    candidates = [
+        os.path.join(CACHE_DIR, name)
+        for name in os.listdir(CACHE_DIR)
+        if name.startswith(f"{stem}.") and name.endswith(suffix)
+    ]
+    return max(candidates, key=os.path.getmtime, default=None)
+
+
+class FrameBuffer:
+    """A read-only frame that appended rows can extend without copying it.
+
+    Numpy columns live in buffers with room to spare, and each frame handed
+    out views their first rows, read-only. Appended rows are written past
+    every row an earlier frame can see, so those frames never change; a full
+    buffer is replaced by one twice the size, which keeps the copying
+    proportional to the rows appended. Arrow-backed columns are immutable
+    already and gain a chunk per append, until MAX_STRING_CHUNKS are merged.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._columns = list(df.columns)
+        self._rows = len(df)
+        self._buffers = {
+            name: df[name].to_numpy(copy=True)
+            for name in df.columns
+            if isinstance(df[name].dtype, np.dtype)
+        }
+        self._arrays = {
+            name: df[name].array for name in df.columns if name not in self._buffers
+        }
+        self.frame = self._view()
+
+    def append(self, tail: pd.DataFrame) -> pd.DataFrame:
+        """The current frame with ``tail`` appended, which becomes ``frame``."""
+        tail = compact(tail)
+        rows = self._rows + len(tail)
+        for name, buffer in self._buffers.items():
+            if rows > len(buffer):
+                grown = np.empty(max(rows, 2 * len(buffer)), dtype=buffer.dtype)
+                grown[: self._rows] = buffer[: self._rows]
+                self._buffers[name] = buffer = grown
+            buffer[self._rows : rows] = tail[name].to_numpy()
+        for name, values in self._arrays.items():
+            values = type(values)._concat_same_type([values, tail[name].array])
+            chunks = getattr(values, "_pa_array", None)
+            if chunks is not None and chunks.num_chunks > MAX_STRING_CHUNKS:
+                values = type(values)(chunks.combine_chunks())
+            self._arrays[name] = values
+        self._rows = rows
+        self.frame = self._view()
+        return self.frame
+
+    def _view(self) -> pd.DataFrame:
+        columns = {}
+        for name in self._columns:
+            if name in self._buffers:
+                values = self._buffers[name][: self._rows]
+                values.flags.writeable = False
+                columns[name] = values
+            else:
+                columns[name] = self._arrays[name]
+        return pd.DataFrame(columns, copy=False)
+
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild ``df`` on read-only backing arrays.
+
+    The result is meant to be shared by every session without copying: any
+    in-place write to its values raises instead of silently changing what
+    other sessions see. Arrow-backed columns are immutable already. The
+    frame object itself is not protected, so share it behind a shallow copy
+    per caller (see Snapshot.frame).
+    """
+    return FrameBuffer(df).frame
+
+
+def read_stats(cached: str) -> dict:
+    """Row count, dropped rows, year range and max vote_count of a cache file."""
+    metadata = pq.read_metadata(cached).metadata or {}
+    return json.loads(metadata[STATS_KEY.encode()])
+
+
+def cache_parts(cached: str) -> list[str]:
+    """Paths of the files that together hold the rows of a cache version,
+    in row order; the last is ``cached`` itself."""
+    return [os.path.join(os.path.dirname(cached), name) for name in read_stats(cached)["parts"]]
+
+
+def read_cache(cached: str) -> pd.DataFrame:
+    """Every row of a cache version."""
+    tables = [pq.read_table(part) for part in cache_parts(cached)]
+    return pa.concat_tables(tables).to_pandas()
+
+
+def read_rows(cached: str, start: int) -> pd.DataFrame | None:
+    """Rows ``start`` onward of a cache version, or None if ``start`` does
+    not fall on a row group boundary (appends always do; merging parts
+    keeps their row groups)."""
+    parts = cache_parts(cached)
+    offset = 0
+    for index, part in enumerate(parts):
+        parquet = pq.ParquetFile(part)
+        for group in range(parquet.num_row_groups):
+            if offset == start:
+                groups = list(range(group, parquet.num_row_groups))
+                tables = [parquet.read_row_groups(groups)]
+                tables += [pq.read_table(rest) for rest in parts[index + 1 :]]
+                return pa.concat_tables(tables).to_pandas()
+            offset += parquet.metadata.row_group(group).num_rows
+    if offset == start:
+        return pq.read_schema(cached).empty_table().to_pandas()
+    return None
+
+
+def ensure_cache() -> str:
+    """Path of the cache for the current source, bringing it up to date.
+
+    A source that only grew is handled by append_cache; any other change
+    rebuilds from scratch.
+    """
+    path = source_path()
+    cached = cache_path(path)
+    if not os.path.exists(cached):
+        with _acquire_lock:
+            if not os.path.exists(cached):
+                previous = _previous_cache(path)
+                if previous is None or append_cache(path, previous) is None:
+                    build_cache(path)
+    return cached
+
+
+def load_movies() -> pd.DataFrame:
+    """Read the movie table from the Parquet cache, building it if stale."""
+    return freeze(read_cache(ensure_cache()))
+
+
+def load_stats() -> dict:
+    """Summary statistics of the movie table, without reading its rows."""
+    return read_stats(ensure_cache())
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# Plot area of the scatter in SVG units (the 900x700 viewBox minus its
+# margins). Cells are regular hexagons in this space, so the number of cells
+# is bounded by the plot size, not by the number of rows.
+PLOT_WIDTH = 806
+PLOT_HEIGHT = 610
+HEX_RADIUS = 12.0
+
+
+def hex_centers(
+    px: np.ndarray, py: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Center of the pointy-top hexagon containing each point.
+
+    Uses d3-hexbin's lattice (columns ``sqrt(3) * radius`` apart, rows
+    ``1.5 * radius`` apart, odd rows shifted half a column), vectorized.
+    """
+    dx = radius * 2 * np.sin(np.pi / 3)
+    dy = radius * 1.5
+
+    fy = py / dy
+    row = np.round(fy)
+    odd = row.astype(np.int64) & 1
+    fx = px / dx - odd / 2
+    col = np.round(fx)
+
+    # Near a row boundary the neighbouring row's center may be closer.
+    ry = fy - row
+    rx = fx - col
+    col2 = col + np.where(fx < col, -0.5, 0.5)
+    row2 = row + np.where(fy < row, -1, 1)
+    rx2 = fx - col2
+    ry2 = fy - row2
+    near = (rx * dx) ** 2 + (ry * dy) ** 2
+    other = (rx2 * dx) ** 2 + (ry2 * dy) ** 2
+    swap = (np.abs(ry) * 3 > 1) & (near > other)
+    col = np.where(swap, col2 + np.where(odd == 1, 0.5, -0.5), col)
+    row = np.where(swap, row2, row)
+
+    centers_x = (col + (row.astype(np.int64) & 1) / 2) * dx
+    centers_y = row * dy
+    return centers_x, centers_y
+
+
+def hexbin(
+    df: pd.DataFrame,
+    positions: np.ndarray,
+    groups: pd.Categorical,
+    radius: float = HEX_RADIUS,
+) -> tuple[pd.DataFrame, tuple[float, float, float, float]]:
+    """Aggregate the given rows into hexagonal cells over rating x popularity.
+
+    ``groups`` holds the year-group label of each row in ``positions``.
+    Returns one row per non-empty cell (center in plot units, count, mean
+    vote_count and the most common year group) and the data extent
+    (x0, x1, y0, y1) the plot units were computed against.
+    """
+    columns = ["x", "y", "count", "mean_votes", "year_bin_label"]
+    if len(positions) == 0:
+        return pd.DataFrame(columns=columns), (0.0, 1.0, 0.0, 1.0)
+
+    rating = df["vote_average"].to_numpy()[positions].astype(np.float64)
+    popularity = df["popularity"].to_numpy()[positions].astype(np.float64)
+    votes = df["vote_count"].to_numpy()[positions].astype(np.float64)
+
+    x0, x1 = float(rating.min()), float(rating.max())
+    y0, y1 = float(popularity.min()), float(popularity.max())
+    px = (rating - x0) / ((x1 - x0) or 1.0) * PLOT_WIDTH
+    py = (y1 - popularity) / ((y1 - y0) or 1.0) * PLOT_HEIGHT
+    cx, cy = hex_centers(px, py, radius)
+
+    # Half-column and row steps are integers, which makes a compact cell id.
+    half_col = np.round(cx / (radius * np.sin(np.pi / 3))).astype(np.int64)
+    row = np.round(cy / (radius * 1.5)).astype(np.int64)
+    cell_ids, first, cells = np.unique(
+        row * (1 << 20) + half_col, return_index=True, return_inverse=True
+    )
+    n_cells = len(cell_ids)
+
+    counts = np.bincount(cells, minlength=n_cells)
+    mean_votes = np.bincount(cells, weights=votes, minlength=n_cells) / counts
+
+    n_groups = len(groups.categories)
+    by_group = np.bincount(
+        cells * n_groups + groups.codes, minlength=n_cells * n_groups
+    ).reshape(n_cells, n_groups)
+    dominant = pd.Categorical.from_codes(
+        by_group.argmax(axis=1), categories=groups.categories
+    )
+
+    result = pd.DataFrame(
+        {
+            "x": cx[first],
+            "y": cy[first],
+            "count": counts,
+            "mean_votes": mean_votes,
+            "year_bin_label": dominant,
+        }
+    )
+    return result, (x0, x1, y0, y1)
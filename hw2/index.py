@@ -0,0 +1,96 @@
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+
+# Year groupings offered by the view; their bin labels are precomputed.
+BIN_SIZES = (5, 10)
+
+
+class MovieIndex:
+    """Precomputed ordering for the hw2 year / vote / top-N query.
+
+    Rows are ranked once by vote_count (descending). For each release year
+    the index keeps that year's ranks in ascending order, so a query only
+    binary-searches one short segment per year instead of scanning, copying
+    and sorting the whole frame.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        votes = df["vote_count"].to_numpy()
+        years = df["release_year"].to_numpy()
+
+        # Frame position of each rank, and the negated vote count per rank
+        # (ascending, so searchsorted can find the min_votes cut).
+        self.order = np.argsort(-votes.astype(np.int64), kind="stable")
+        self._neg_votes = -votes[self.order].astype(np.int64)
+        # Rank of each frame position, the inverse of order.
+        self.ranks = np.empty_like(self.order)
+        self.ranks[self.order] = np.arange(len(self.order))
+
+        # Ranks grouped by year; within a year they stay ascending.
+        years_by_rank = years[self.order]
+        by_year = np.argsort(years_by_rank, kind="stable")
+        self.year_ranks = by_year
+        sorted_years = years_by_rank[by_year]
+        self.years, self.year_starts = np.unique(sorted_years, return_index=True)
+        self.year_ends = np.append(self.year_starts[1:], len(sorted_years))
+
+        self._years = years
+        self._bins: dict[int, tuple[np.ndarray, list[str]]] = {}
+        for bin_size in BIN_SIZES:
+            self._bin_codes(bin_size)
+
+    def query(
+        self, year_range: tuple[int, int], min_votes: int, max_points: int
+    ) -> tuple[np.ndarray, int]:
+        """Frame positions of the top ``max_points`` rows by vote_count.
+
+        Returns the positions (highest vote_count first) and the number of
+        rows that matched the filter before the top-N cut.
+        """
+        matched = 0
+        parts = []
+        for segment in self._segments(year_range, min_votes):
+            matched += len(segment)
+            parts.append(segment[:max_points])
+
+        if not parts:
+            return np.empty(0, dtype=np.int64), 0
+        ranks = np.concatenate(parts)
+        if len(ranks) > max_points:
+            ranks = np.partition(ranks, max_points - 1)[:max_points]
+        ranks.sort()
+        return self.order[ranks], matched
+
+    def matches(self, year_range: tuple[int, int], min_votes: int) -> np.ndarray:
+        """Frame positions of every row matching the filter, in no particular order."""
+        parts = list(self._segments(year_range, min_votes))
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return self.order[np.concatenate(parts)]
+
+    def _segments(self, year_range: tuple[int, int], min_votes: int) -> Iterator[np.ndarray]:
+        """Per-year runs of matching ranks, each ascending."""
+        # Ranks below `limit` have vote_count >= min_votes.
+        limit = int(np.searchsorted(self._neg_votes, -min_votes, side="right"))
+        lo = int(np.searchsorted(self.years, year_range[0], side="left"))
+        hi = int(np.searchsorted(self.years, year_range[1], side="right"))
+        for start, end in zip(self.year_starts[lo:hi], self.year_ends[lo:hi]):
+            segment = self.year_ranks[start:end]
+            yield segment[: int(np.searchsorted(segment, limit))]
+
+    def bin_labels(self, bin_size: int, positions: np.ndarray) -> pd.Categorical:
+        """Year-group labels ("1990-1994") for the given frame positions."""
+        codes, categories = self._bin_codes(bin_size)
+        return pd.Categorical.from_codes(codes[positions], categories=categories)
+
+    def _bin_codes(self, bin_size: int) -> tuple[np.ndarray, list[str]]:
+        if bin_size not in self._bins:
+            starts = (self._years.astype(np.int32) // bin_size) * bin_size
+            first = int(starts.min()) if len(starts) else 0
+            last = int(starts.max()) if len(starts) else 0
+            categories = [f"{s}-{s + bin_size - 1}" for s in range(first, last + 1, bin_size)]
+            codes = ((starts - first) // bin_size).astype(np.int16)
+            self._bins[bin_size] = (codes, categories)
+        return self._bins[bin_size]
@@ -0,0 +1,268 @@
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import pandas as pd
+
+from hw2.dataset import (
+    EXPECTED_SHA256,
+    FrameBuffer,
+    derived_path,
+    ensure_cache,
+    read_cache,
+    read_rows,
+    read_stats,
+)
+from hw2.index import MovieIndex
+from hw2.rollup import YearRollup
+from hw2.search import SearchIndex
+from hw2.similar import SimilarMovies
+
+logger = logging.getLogger(__name__)
+
+# How often, at most, the source file is checked for changes. The check is a
+# stat() of the source, so it is cheap enough to run on a rerun.
+REFRESH_SECONDS = float(os.environ.get("HW2_REFRESH_SECONDS", "2"))
+# A source pinned by HW2_SOURCE_SHA256 fails its check as soon as anything
+# is appended, so it is loaded once and not followed.
+FOLLOW_SOURCE = not EXPECTED_SHA256
+
+
+class Snapshot:
+    """One version of the movie table and the structures derived from it.
+
+    Snapshots never change once published: a refresh builds a new one, and a
+    rerun that already holds the old one finishes on it. The index and
+    rollup are built on first use. The search index and similar-movies table
+    are filled in by LiveMovies from background threads.
+    """
+
+    def __init__(
+        self, cached: str, frame: pd.DataFrame, stats: dict, previous: "Snapshot | None" = None
+    ) -> None:
+        self.cached = cached
+        self._frame = frame
+        self.stats = stats
+        # Unique per cache file, so per-snapshot results can be keyed on it.
+        self.version = os.path.basename(cached)
+        self._lock = threading.Lock()
+        self._derived: dict[str, Any] = {}
+        # The newest search index over a prefix of this frame: answered from
+        # until this snapshot's own is ready, then extended rather than
+        # rebuilt. The previous snapshot itself is not kept, so its frame can
+        # be freed.
+        self._search: SearchIndex | None = None
+        self._base_search: SearchIndex | None = None
+        # Likewise the newest similar-movies table, answered from until this
+        # snapshot's own is ready; positions hold across an append.
+        self._similar: SimilarMovies | None = None
+        self._base_similar: SimilarMovies | None = None
+        if previous is not None:
+            self._base_search = previous.search
+            self._base_similar = previous.similar
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The movie table, as a shallow copy of the shared one.
+
+        Its values are read-only, but the container is not: assigning a
+        column or sorting in place would change the frame for every session.
+        The copy is cheap and takes such changes on itself.
+        """
+        return self._frame.copy(deep=False)
+
+    @property
+    def index(self) -> MovieIndex:
+        return self._get("index", lambda: MovieIndex(self._frame))
+
+    @property
+    def rollup(self) -> YearRollup:
+        return self._get("rollup", lambda: YearRollup(self._frame))
+
+    @property
+    def search(self) -> SearchIndex | None:
+        """The search index, or None while the first one is built.
+
+        Until this snapshot's own index is ready the previous one answers,
+        without the appended rows.
+        """
+        # The base first: publishing sets the own index, then drops the base.
+        base = self._base_search
+        return self._search if self._search is not None else base
+
+    @property
+    def similar(self) -> SimilarMovies | None:
+        """The similar-movies table, or None while the first one is built."""
+        base = self._base_similar
+        return self._similar if self._similar is not None else base
+
+    def _build_search(self) -> SearchIndex:
+        if self._base_search is None:
+            return SearchIndex(self._frame)
+        # Only the appended rows are tokenized.
+        return self._base_search.extended(self._frame)
+
+    def _publish_search(self, index: SearchIndex) -> None:
+        self._search = index
+        self._base_search = None
+
+    def _publish_similar(self, table: SimilarMovies) -> None:
+        self._similar = table
+        self._base_similar = None
+
+    def _reused_similar(self) -> SimilarMovies | None:
+        """The previous snapshot's table, when no rows were appended since.
+
+        Same lineage and row count means the same rows (the cache only
+        grows), so the table holds as is; a touched source does not cost a
+        rebuild.
+        """
+        base = self._base_similar
+        return base if base is not None and len(base) == len(self._frame) else None
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self._derived:
+            with self._lock:
+                if name not in self._derived:
+                    self._derived[name] = build()
+        return self._derived[name]
+
+
+class _Worker:
+    """Runs ``job`` in one background thread, for the newest snapshot only.
+
+    A snapshot handed over while the thread is busy replaces any other still
+    waiting, so work never piles up behind a burst of appends. A long job
+    can check ``superseded()`` and give up on a snapshot nobody reads.
+    """
+
+    def __init__(self, name: str, job: Callable[[Snapshot], None]) -> None:
+        self._name = name
+        self._job = job
+        self._lock = threading.Lock()
+        self._wanted: Snapshot | None = None
+        self._running = False
+
+    def submit(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            self._wanted = snapshot
+            if self._running:
+                return
+            self._running = True
+        threading.Thread(target=self._run, name=self._name, daemon=True).start()
+
+    def superseded(self) -> bool:
+        with self._lock:
+            return self._wanted is not None
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                snapshot = self._wanted
+                self._wanted = None
+                if snapshot is None:
+                    self._running = False
+                    return
+            try:
+                self._job(snapshot)
+            except Exception:
+                logger.exception("%s failed", self._name)
+
+
+class LiveMovies:
+    """The current Snapshot of the movie table, following the source file.
+
+    At most every REFRESH_SECONDS a caller hands the source check to a
+    background thread and goes on with the current snapshot. When the source
+    only grew, ensure_cache wrote the new rows to a part of their own; only
+    they are read, and written into the spare room of the frame's buffers
+    (FrameBuffer), and the search index is extended rather than rebuilt. Any
+    other change reloads the whole cache. A source pinned by checksum is
+    never checked again (FOLLOW_SOURCE).
+
+    Only the first load blocks a rerun. The refresh, search index and
+    similar-movies table each have a background thread that works on the
+    newest snapshot only (_Worker). A snapshot superseded while its
+    similar-movies table was being built is skipped, and its table is
+    neither published nor saved.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Snapshot | None = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        # Backs the current snapshot's frame; only the refresh thread, or
+        # the first load before it exists, touches it.
+        self._buffer: FrameBuffer | None = None
+        self._refresh = _Worker("hw2-refresh", self._follow)
+        self._search = _Worker("hw2-search", self._index_search)
+        self._similar = _Worker("hw2-similar", self._index_similar)
+
+    def snapshot(self) -> Snapshot:
+        current = self._snapshot
+        if current is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._publish(self._load(None))
+                    self._checked = time.monotonic()
+            return self._snapshot
+        if FOLLOW_SOURCE and time.monotonic() - self._checked >= REFRESH_SECONDS:
+            self._checked = time.monotonic()
+            self._refresh.submit(current)
+        return current
+
+    def _follow(self, asked: Snapshot) -> None:
+        """Load what changed in the source since the current snapshot.
+
+        Runs on the refresh thread, the only one that publishes after the
+        first load, so the current snapshot is the one to extend even if
+        ``asked`` was handed over before a newer one was published. A failure
+        leaves the current snapshot in place; the next check retries.
+        """
+        current = self._snapshot
+        snapshot = self._load(current)
+        if snapshot is not current:
+            self._publish(snapshot)
+
+    def _publish(self, snapshot: Snapshot) -> None:
+        self._snapshot = snapshot
+        self._search.submit(snapshot)
+        self._similar.submit(snapshot)
+
+    @staticmethod
+    def _index_search(snapshot: Snapshot) -> None:
+        snapshot._publish_search(snapshot._build_search())
+
+    def _index_similar(self, snapshot: Snapshot) -> None:
+        path = derived_path(snapshot.cached, "similar.npz")
+        if os.path.exists(path):
+            table = SimilarMovies.load(path)
+        else:
+            table = snapshot._reused_similar()
+            if table is None:
+                table = SimilarMovies.build(snapshot.frame)
+            if self._similar.superseded():
+                # The newer snapshot builds its own.
+                return
+            table.save(path)
+            if self._snapshot is not snapshot:
+                # A newer version replaced this one meanwhile, and pruned
+                # the files derived from it.
+                os.remove(path)
+        snapshot._publish_similar(table)
+
+    def _load(self, current: Snapshot | None) -> Snapshot:
+        cached = ensure_cache()
+        if current is not None and cached == current.cached:
+            return current
+        stats = read_stats(cached)
+        if current is not None and stats["lineage"] == current.stats["lineage"]:
+            tail = read_rows(cached, current.stats["rows"])
+            if tail is not None:
+                frame = self._buffer.append(tail)
+                return Snapshot(cached, frame, stats, previous=current)
+        self._buffer = FrameBuffer(read_cache(cached))
+        return Snapshot(cached, self._buffer.frame, stats)
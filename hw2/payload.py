@@ -0,0 +1,75 @@
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Little-endian typed-array types the chart script can view directly.
+TYPED = {
+    "int16": "<i2",
+    "int32": "<i4",
+    "float32": "<f4",
+}
+
+
+class ColumnEncoder:
+    """Pack columns into one binary buffer plus a small JSON layout.
+
+    Numeric columns become typed arrays (Int16Array, Int32Array,
+    Float32Array in the browser). String columns are dictionary-encoded:
+    the distinct values go in the layout and each row carries an index.
+    Every array starts on a 4-byte boundary so the browser can wrap each one
+    in a typed-array view of the received buffer.
+    """
+
+    def __init__(self) -> None:
+        self.layout: list[dict[str, Any]] = []
+        self._chunks: list[bytes] = []
+        self._size = 0
+
+    def _append(self, name: str, kind: str, array: np.ndarray, **extra: Any) -> None:
+        pad = -self._size % 4
+        if pad:
+            self._chunks.append(b"\0" * pad)
+            self._size += pad
+        data = array.tobytes()
+        self.layout.append(
+            {"name": name, "type": kind, "offset": self._size, "length": len(array), **extra}
+        )
+        self._chunks.append(data)
+        self._size += len(data)
+
+    def numeric(self, name: str, values: np.ndarray | pd.Series, kind: str) -> None:
+        self._append(name, kind, np.asarray(values).astype(TYPED[kind], copy=False))
+
+    def dictionary(self, name: str, values: pd.Series) -> None:
+        # Missing values get a code of their own, which decodes to null.
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        kind = "int16" if len(uniques) < 2**15 else "int32"
+        self._append(
+            name,
+            kind,
+            codes.astype(TYPED[kind], copy=False),
+            values=[None if pd.isna(v) else str(v) for v in uniques],
+        )
+
+    def buffer(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def payload_bytes(self) -> int:
+        """Bytes on the wire: the binary buffer plus the JSON layout."""
+        return self._size + len(json.dumps(self.layout))
+
+
+def encode_rows(keys: np.ndarray, rows: pd.DataFrame) -> ColumnEncoder:
+    """The scatter's point payload: the keys to display, then the new rows."""
+    encoder = ColumnEncoder()
+    encoder.numeric("keys", keys, "int32")
+    encoder.numeric("key", rows.index, "int32")
+    encoder.dictionary("title", rows["title"])
+    encoder.numeric("release_year", rows["release_year"], "int16")
+    encoder.numeric("vote_average", rows["vote_average"], "float32")
+    encoder.numeric("popularity", rows["popularity"], "float32")
+    encoder.numeric("vote_count", rows["vote_count"], "int32")
+    encoder.dictionary("year_bin_label", rows["year_bin_label"])
+    return encoder
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# Width of the vote-count buckets; matches the "Minimum vote count" slider
+# step, so every threshold the slider offers falls on a bucket edge.
+VOTE_STEP = 100
+
+# Ratings are 0-10; medians come from a per-cell histogram of this many bins,
+# interpolated within the bin (so within one bin width, 0.1, of the exact
+# value).
+RATING_BINS = 100
+RATING_MAX = 10.0
+
+
+class YearRollup:
+    """Per-year, per-vote-bucket aggregates of the movie table.
+
+    Built once per frame. Each (release year, vote bucket) cell holds the
+    row count, the sums of vote_average, popularity and vote_count, and a
+    vote_average histogram. Cells are ordered by year, then by bucket from
+    highest to lowest, and the aggregates are stored as running totals in
+    that order. Within a year, the cells at or above any vote threshold
+    then form a prefix, and one subtraction gives their total. A summary
+    therefore costs a binary search and a subtraction per year, whatever the
+    number of rows.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        years = df["release_year"].to_numpy().astype(np.int64)
+        buckets = df["vote_count"].to_numpy().astype(np.int64) // VOTE_STEP
+        rating = df["vote_average"].to_numpy().astype(np.float64)
+
+        # Cell id sorts by year ascending, then bucket descending.
+        top = int(buckets.max()) + 1 if len(buckets) else 1
+        cell_ids, cells = np.unique(years * top + (top - 1 - buckets), return_inverse=True)
+        n_cells = len(cell_ids)
+        cell_years = cell_ids // top
+        self._buckets = top - 1 - cell_ids % top
+
+        sums = np.column_stack(
+            [
+                np.bincount(cells, minlength=n_cells),
+                np.bincount(cells, weights=rating, minlength=n_cells),
+                np.bincount(cells, weights=df["popularity"].to_numpy(), minlength=n_cells),
+                np.bincount(cells, weights=df["vote_count"].to_numpy(), minlength=n_cells),
+            ]
+        )
+        # Rounded first: float32 ratings sit just off the bin edges (5.1 is
+        # 50.99999 bins), and truncating would put them in the bin below.
+        bins = np.floor(np.round(rating / RATING_MAX * RATING_BINS, 3)).astype(np.int64)
+        bins = np.clip(bins, 0, RATING_BINS - 1)
+        hist = np.bincount(
+            cells * RATING_BINS + bins, minlength=n_cells * RATING_BINS
+        ).reshape(n_cells, RATING_BINS)
+
+        # Running totals with a leading zero row, so a run of cells
+        # [start, end) sums to totals[end] - totals[start].
+        self._sums = np.vstack([np.zeros((1, 4)), np.cumsum(sums, axis=0)])
+        self._hist = np.vstack(
+            [np.zeros((1, RATING_BINS), dtype=np.int64), np.cumsum(hist, axis=0)]
+        )
+        self.years, self._year_starts = np.unique(cell_years, return_index=True)
+        self._year_ends = np.append(self._year_starts[1:], n_cells)
+
+    def summary(
+        self, year_range: tuple[int, int], min_votes: int, bin_size: int
+    ) -> pd.DataFrame:
+        """Statistics per year group for movies with vote_count >= min_votes.
+
+        ``min_votes`` is rounded down to a multiple of VOTE_STEP.
+        """
+        bucket = min_votes // VOTE_STEP
+        lo = int(np.searchsorted(self.years, year_range[0], side="left"))
+        hi = int(np.searchsorted(self.years, year_range[1], side="right"))
+        years = self.years[lo:hi]
+        starts = self._year_starts[lo:hi]
+        ends = np.array(
+            [
+                start + int(np.searchsorted(-self._buckets[start:end], -bucket, side="right"))
+                for start, end in zip(starts, self._year_ends[lo:hi])
+            ],
+            dtype=np.int64,
+        )
+        sums = self._sums[ends] - self._sums[starts]
+        hist = self._hist[ends] - self._hist[starts]
+
+        # Fold the per-year rows into year groups.
+        group_starts = (years // bin_size) * bin_size
+        labels, groups = np.unique(group_starts, return_inverse=True)
+        group_sums = np.zeros((len(labels), 4))
+        group_hist = np.zeros((len(labels), RATING_BINS), dtype=np.int64)
+        np.add.at(group_sums, groups, sums)
+        np.add.at(group_hist, groups, hist)
+
+        count = group_sums[:, 0]
+        keep = count > 0
+        count = count[keep]
+        return pd.DataFrame(
+            {
+                "Years": [f"{s}-{s + bin_size - 1}" for s in labels[keep]],
+                "Movies": count.astype(np.int64),
+                "Mean rating": group_sums[keep, 1] / count,
+                "Median rating": _hist_median(group_hist[keep]),
+                "Mean popularity": group_sums[keep, 2] / count,
+                "Total votes": group_sums[keep, 3].astype(np.int64),
+            }
+        )
+
+
+def _hist_median(hist: np.ndarray) -> np.ndarray:
+    """Median of each (non-empty) histogram row, interpolated within bins.
+
+    A bin's values are taken as evenly spread across it, and the middle one
+    or two values are read off where they fall. Each lands in the bin of the
+    value it stands for, so the result is within one bin width of the exact
+    median, even when an empty stretch separates the two middle values.
+    """
+    if len(hist) == 0:
+        return np.empty(0)
+    count = hist.sum(axis=1)
+    lower = _hist_value(hist, (count - 1) // 2 + 0.5)
+    upper = _hist_value(hist, count // 2 + 0.5)
+    return (lower + upper) / 2
+
+
+def _hist_value(hist: np.ndarray, rank: np.ndarray) -> np.ndarray:
+    """Value at ``rank`` (0 to the row count, from the bottom) of each row."""
+    width = RATING_MAX / RATING_BINS
+    cum = np.cumsum(hist, axis=1)
+    idx = (cum < rank[:, None]).sum(axis=1)
+    rows = np.arange(len(hist))
+    below = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0)
+    return (idx + (rank - below) / np.maximum(hist[rows, idx], 1)) * width
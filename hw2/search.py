@@ -0,0 +1,214 @@
+import bisect
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from hw2.tokens import split_words, tokenize
+
+# The token being typed is matched as a prefix once it has this many
+# characters; shorter ones must match a whole word, which keeps a one- or
+# two-letter prefix from expanding to most of the vocabulary.
+MIN_PREFIX = 3
+# A prefix stands for at most this many words, its most used ones.
+MAX_EXPANSIONS = 64
+# Appended segments past this many are merged back into one, so a source
+# that grows every day does not slow queries down segment by segment.
+MAX_SEGMENTS = 8
+# Word matches are collected over a window of ranks that starts this wide
+# and doubles until there are enough of them.
+FIRST_WINDOW = 4096
+# Sorts after every character, to close a prefix range.
+_PREFIX_END = "\U0010ffff"
+
+class _Segment:
+    """Title and word indexes over the frame rows ``start`` onward.
+
+    * a prefix index: lower-cased titles in sorted order (an Arrow array),
+      so every title starting with the query is one contiguous range;
+    * an inverted index: the sorted vocabulary of title and overview words,
+      each with the movies that use it in rank order, most votes first.
+
+    Ranks are local to the segment, but they order its rows as MovieIndex
+    ranks the whole frame (vote_count descending, then position), so a
+    query can walk them from the top and stop once it has enough.
+    """
+
+    def __init__(self, df: pd.DataFrame, start: int) -> None:
+        self.start = start
+        rows = df.iloc[start:].reset_index(drop=True)
+        n = max(len(rows), 1)
+
+        # Frame position of each local rank, and the rank of each row.
+        order = np.argsort(-rows["vote_count"].to_numpy().astype(np.int64), kind="stable")
+        self._positions = order + start
+        local_rank = np.empty(len(order), dtype=np.int64)
+        local_rank[order] = np.arange(len(order))
+
+        titles = pa.array(rows["title"], type=pa.string(), from_pandas=True)
+        titles = pc.utf8_lower(pc.fill_null(titles, ""))
+        title_order = pc.array_sort_indices(titles)
+        self._titles = titles.take(title_order)
+        self._title_positions = title_order.to_numpy() + start
+
+        text = rows["title"].str.cat(rows["overview"], sep=" ", na_rep="")
+        local, codes, self._vocab = tokenize(text)
+        # Sort the (word, rank) pairs, packed into one integer, so each word's
+        # postings are one ascending run of ranks; repeats of a word in a row
+        # become adjacent and are dropped.
+        pairs = np.sort(codes * n + local_rank[local])
+        first = np.ones(len(pairs), dtype=bool)
+        first[1:] = pairs[1:] != pairs[:-1]
+        pairs = pairs[first]
+        codes = pairs // n
+        self._postings = (pairs % n).astype(np.int32)
+        self._offsets = np.searchsorted(codes, np.arange(len(self._vocab) + 1))
+
+    def by_title(self, query: str) -> np.ndarray:
+        """Frame positions of the titles starting with ``query``, unordered."""
+        lo = _bisect(self._titles, query)
+        hi = _bisect(self._titles, query + _PREFIX_END)
+        return self._title_positions[lo:hi]
+
+    def by_words(
+        self, tokens: list[str], keep: Callable[[np.ndarray], np.ndarray], limit: int
+    ) -> np.ndarray:
+        """The first ``limit`` movies using every token that ``keep`` accepts.
+
+        Frame positions, in rank order. Ranks are taken a window at a time:
+        the tokens' postings inside the window are intersected, rarest
+        first, and the walk stops once ``limit`` movies are found or a token
+        has no postings left.
+        """
+        runs = []
+        for i, token in enumerate(tokens):
+            prefix = i == len(tokens) - 1 and len(token) >= MIN_PREFIX
+            token_runs = self._runs(token, prefix)
+            if not token_runs:
+                return np.empty(0, dtype=np.int64)
+            runs.append(token_runs)
+        if not runs or limit <= 0:
+            return np.empty(0, dtype=np.int64)
+        runs.sort(key=lambda token_runs: sum(len(run) for run in token_runs))
+        end = min(max(int(run[-1]) for run in token_runs) for token_runs in runs) + 1
+
+        found = []
+        count = 0
+        lo, size = 0, FIRST_WINDOW
+        while lo < end and count < limit:
+            hi = min(lo + size, end)
+            ranks = _window(runs[0], lo, hi)
+            for token_runs in runs[1:]:
+                if not len(ranks):
+                    break
+                ranks = np.intersect1d(ranks, _window(token_runs, lo, hi), assume_unique=True)
+            positions = self._positions[ranks]
+            positions = positions[keep(positions)]
+            found.append(positions)
+            count += len(positions)
+            lo, size = hi, size * 2
+        return np.concatenate(found)[:limit] if found else np.empty(0, dtype=np.int64)
+
+    def _runs(self, token: str, prefix: bool) -> list[np.ndarray]:
+        """The postings of each word ``token`` stands for."""
+        lo, hi = _range(self._vocab, token, prefix)
+        words = np.arange(lo, hi)
+        if len(words) > MAX_EXPANSIONS:
+            sizes = self._offsets[lo + 1 : hi + 1] - self._offsets[lo:hi]
+            words = words[np.argpartition(-sizes, MAX_EXPANSIONS - 1)[:MAX_EXPANSIONS]]
+        return [self._postings[self._offsets[w] : self._offsets[w + 1]] for w in words]
+
+
+class SearchIndex:
+    """In-memory title and overview search for the hw2 view.
+
+    The index is a list of segments, each covering a contiguous run of frame
+    rows. Rows appended to the frame get a segment of their own (see
+    extended), so picking them up never re-tokenizes the rows already
+    indexed. Every movie lives in exactly one segment, so a multi-word query
+    is answered segment by segment and the hits concatenated.
+    """
+
+    def __init__(self, df: pd.DataFrame, segments: list[_Segment] | None = None) -> None:
+        self._segments = segments if segments is not None else [_Segment(df, 0)]
+        self._rows = len(df)
+
+    def extended(self, df: pd.DataFrame) -> "SearchIndex":
+        """A new index over ``df``, the frame this one covers plus appended rows."""
+        if len(df) == self._rows:
+            return self
+        segments = self._segments
+        start = self._rows
+        if len(segments) >= MAX_SEGMENTS:
+            # Re-index everything after the first (full) segment together.
+            segments, start = segments[:1], segments[1].start
+        return SearchIndex(df, [*segments, _Segment(df, start)])
+
+    def search(
+        self,
+        query: str,
+        ranks: np.ndarray,
+        limit: int | None = None,
+        keep: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> np.ndarray:
+        """Frame positions matching ``query``, most-voted first.
+
+        Titles starting with the query come first. Then come movies whose
+        title or overview contains every query word; the last word may be
+        a prefix, since it is usually still being typed. ``ranks`` gives
+        each position's vote rank (MovieIndex.ranks). Only positions
+        ``keep`` accepts (a mask over an array of positions) count, and at
+        most ``limit`` are returned; word matches stop being collected once
+        there are enough.
+        """
+        query = " ".join(query.lower().split())
+        if not query:
+            return np.empty(0, dtype=np.int64)
+        if limit is None:
+            limit = self._rows
+
+        by_title = np.concatenate([s.by_title(query) for s in self._segments])
+        if keep is not None:
+            by_title = by_title[keep(by_title)]
+        by_title = _first(by_title, ranks, limit)
+
+        def keep_words(positions: np.ndarray) -> np.ndarray:
+            mask = ~np.isin(positions, by_title)
+            return mask if keep is None else mask & keep(positions)
+
+        tokens = split_words(query)
+        wanted = limit - len(by_title)
+        by_words = np.concatenate(
+            [s.by_words(tokens, keep_words, wanted) for s in self._segments]
+        )
+        by_words = _first(by_words, ranks, wanted)
+        return np.concatenate([by_title, by_words]).astype(np.int64)
+
+
+def _first(positions: np.ndarray, ranks: np.ndarray, limit: int) -> np.ndarray:
+    """The ``limit`` best-ranked of ``positions``, in rank order."""
+    if len(positions) > limit:
+        if limit <= 0:
+            return positions[:0]
+        positions = positions[np.argpartition(ranks[positions], limit - 1)[:limit]]
+    return positions[np.argsort(ranks[positions], kind="stable")]
+
+
+def _window(runs: list[np.ndarray], lo: int, hi: int) -> np.ndarray:
+    """The ranks in [lo, hi) found in any of ``runs``, ascending."""
+    parts = [run[np.searchsorted(run, lo) : np.searchsorted(run, hi)] for run in runs]
+    return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+
+def _bisect(values: pa.Array, key: str) -> int:
+    """Where ``key`` goes in the sorted strings ``values``, before equal ones."""
+    return bisect.bisect_left(values, key, key=lambda value: value.as_py())
+
+
+def _range(values: np.ndarray, key: str, prefix: bool) -> tuple[int, int]:
+    lo = int(np.searchsorted(values, key, side="left"))
+    end = key + _PREFIX_END if prefix else key
+    hi = int(np.searchsorted(values, end, side="right"))
+    return lo, hi
@@ -1,37 +1,117 @@
-import json
 import os
+from typing import Any
 
-import kagglehub
+import numpy as np
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
-
-@st.cache_data(show_spinner=False)
-def load_data() -> pd.DataFrame:
-    local_path = os.path.join(os.getcwd(), "top_rated_movies.csv")
-    if os.path.exists(local_path):
-        file_path = local_path
-    else:
-        path = kagglehub.dataset_download(
-            "shraddha4ever20/top-rated-movies-from-tmdb-19902025"
-        )
-        file_path = os.path.join(path, "top_rated_movies.csv")
-    df = pd.read_csv(file_path)
-    df = df.drop(columns=["Unnamed: 0"], errors="ignore")
-    df["release_date"] = pd.to_datetime(df["release_date"], errors="coerce")
-    df["release_year"] = df["release_date"].dt.year
-    df = df.dropna(
-        subset=["release_year", "popularity", "vote_average", "vote_count", "title"]
+from assets import asset_url
+from hw2.density import HEX_RADIUS, hexbin
+from hw2.index import BIN_SIZES
+from hw2.live import LiveMovies, Snapshot
+from hw2.payload import ColumnEncoder, encode_rows
+from hw2.rollup import VOTE_STEP
+from hw2.skyline import skyline_layers
+from hw2.static_chart import scatter_svg
+from perf import instrument, stage
+
+# Persistent scatter component: the SVG, scales, legend state and pinned
+# details live in the iframe, and reruns apply a keyed data join to them.
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_scatter = components.declare_component("scatter", path=_FRONTEND_DIR)
+
+# Above SVG_POINT_LIMIT points the scatter draws on a canvas (Auto renderer);
+# MAX_POINTS caps the selection the canvas is asked to draw.
+SVG_POINT_LIMIT = 3000
+MAX_POINTS = 1_000_000
+# Search matches shipped to the chart for highlighting.
+SEARCH_LIMIT = 50
+# Most Pareto layers the standout highlight offers.
+MAX_LAYERS = 5
+# While the search index or similar-movies table is still being built, how
+# often the view checks whether it is ready.
+INDEX_POLL_SECONDS = 1.0
+
+
+# One set of read-only data per process, shared by every session without the
+# per-call copy st.cache_data would make. Views select rows with take(),
+# which copies only the selection. The snapshot follows the source file:
+# appended rows show up within a few seconds (see LiveMovies). A rerun takes
+# one snapshot up front and uses it throughout, so its frame and indexes
+# always agree.
+@st.cache_resource(show_spinner=False)
+def load_live() -> LiveMovies:
+    return LiveMovies()
+
+
+# Cells depend only on the data version, the filter and grouping, never on
+# Max points, so each combination is aggregated once and reused by every
+# session. The snapshot itself is not hashed; its version stands in for it.
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_density(
+    _snapshot: Snapshot, version: str, year_range: tuple[int, int], min_votes: int, bin_size: int
+) -> tuple[pd.DataFrame, tuple[float, float, float, float], int]:
+    index = _snapshot.index
+    positions = index.matches(year_range, min_votes)
+    cells, extent = hexbin(_snapshot.frame, positions, index.bin_labels(bin_size, positions))
+    return cells, extent, len(positions)
+
+
+# The skyline runs over every matching movie, not the top-N cut; like the
+# density cells it depends only on the data version and the filter.
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_standouts(
+    _snapshot: Snapshot, version: str, year_range: tuple[int, int], min_votes: int, layers: int
+) -> pd.DataFrame:
+    df = _snapshot.frame
+    positions = _snapshot.index.matches(year_range, min_votes)
+    layer = skyline_layers(
+        df["vote_average"].to_numpy()[positions],
+        df["popularity"].to_numpy()[positions],
+        layers,
+    )
+    keep = layer >= 0
+    standouts = pd.DataFrame(
+        {
+            "key": positions[keep],
+            "layer": layer[keep].astype(np.int64) + 1,
+            "vote_average": df["vote_average"].to_numpy()[positions[keep]],
+        }
+    )
+    return standouts.sort_values(
+        ["layer", "vote_average"], ascending=[True, False], ignore_index=True
     )
-    df["release_year"] = df["release_year"].astype(int)
-    return df
 
 
+# Static rendering of the chart, shown until a chart iframe has drawn, keyed
+# by the data version and the settings that shape it. With the default
+# settings this is the same markup for every first visit.
+@st.cache_data(show_spinner=False, max_entries=16)
+def load_first_paint(
+    _filtered: pd.DataFrame,
+    version: str,
+    year_range: tuple[int, int],
+    min_votes: int,
+    max_points: int,
+    bin_size: int,
+) -> str:
+    return scatter_svg(_filtered)
+
+
+@st.fragment
+@instrument("hw2")
 def render_hw2() -> None:
     st.subheader("Showing Data")
 
-    df = load_data()
+    with stage("load_data") as info:
+        try:
+            snapshot = load_live().snapshot()
+        except (OSError, ValueError) as exc:
+            st.error(f"Movie dataset unavailable: {exc}")
+            return
+        df = snapshot.frame
+        info["rows"] = len(df)
 
     st.markdown(
         """
@@ -46,8 +126,9 @@ show whether certain eras produce more standout films.
 """
     )
 
-    min_year = int(df["release_year"].min())
-    max_year = int(df["release_year"].max())
+    summary = snapshot.stats
+    min_year = summary["year_min"]
+    max_year = summary["year_max"]
     default_low = max(min_year, 1990)
     default_high = max_year
     year_range = st.slider(
@@ -60,272 +141,360 @@ show whether certain eras produce more standout films.
     min_votes = st.slider(
         "Minimum vote count",
         min_value=0,
-        max_value=int(df["vote_count"].max()),
+        max_value=summary["max_vote_count"],
         value=1000,
-        step=100,
+        step=VOTE_STEP,
+    )
+
+    display = st.radio(
+        "Display",
+        options=["Points", "Density"],
+        index=0,
+        horizontal=True,
+        help="Density aggregates every matching movie into hexagonal cells "
+        "instead of drawing the top movies by vote count.",
     )
+    density = display == "Density"
 
     max_points = st.slider(
-        "Max points (performance)",
+        "Max points",
         min_value=200,
-        max_value=3000,
+        max_value=max(SVG_POINT_LIMIT, min(len(df), MAX_POINTS)),
         value=1200,
         step=100,
+        disabled=density,
     )
 
-    bin_size = st.selectbox("Year grouping", options=[5, 10], index=0)
+    bin_size = st.selectbox("Year grouping", options=list(BIN_SIZES), index=0)
 
-    filtered = df[
-        (df["release_year"].between(year_range[0], year_range[1]))
-        & (df["vote_count"] >= min_votes)
-    ].copy()
+    renderer = st.radio(
+        "Renderer",
+        options=["Auto", "SVG", "Canvas"],
+        index=0,
+        horizontal=True,
+        help=f"Auto draws with SVG up to {SVG_POINT_LIMIT:,} points and with canvas above that.",
+        disabled=density,
+    )
 
-    filtered = filtered.sort_values("vote_count", ascending=False).head(max_points)
-    filtered["year_bin_start"] = (filtered["release_year"] // bin_size) * bin_size
-    filtered["year_bin_label"] = (
-        filtered["year_bin_start"].astype(int).astype(str)
-        + "-"
-        + (filtered["year_bin_start"] + bin_size - 1).astype(int).astype(str)
+    layers = st.slider(
+        "Standout layers",
+        min_value=0,
+        max_value=MAX_LAYERS,
+        value=1,
+        help="Pareto layers over rating and popularity among all matching movies: "
+        "layer 1 holds the movies nothing beats on both. 0 turns the highlight off.",
     )
 
-    chart_data = filtered[
-        [
-            "title",
-            "release_year",
-            "vote_average",
-            "popularity",
-            "vote_count",
-            "year_bin_label",
-        ]
-    ].to_dict(orient="records")
-
-    data_json = json.dumps(chart_data)
-
-    html = """
-<!DOCTYPE html>
-<html>
-  <head>
-    <meta charset="utf-8" />
-    <script src="https://d3js.org/d3.v7.min.js"></script>
-    <style>
-      .chart-wrap {
-        background: linear-gradient(180deg, #ffffff 0%, #f6f7fb 100%);
-        border: 1px solid #e1e1e1;
-        border-radius: 16px;
-        padding: 16px;
-        padding-bottom: 24px;
-      }
-      .info-row {
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 12px;
-        margin-top: 12px;
-      }
-      .info-card {
-        background: #ffffff;
-        border: 1px solid #e5e7eb;
-        border-radius: 12px;
-        padding: 12px;
-        font: 12px/1.4 Arial, sans-serif;
-        color: #111827;
-      }
-      .side-title {
-        font: 700 13px/1.2 Arial, sans-serif;
-        margin-bottom: 8px;
-      }
-      .detail-row {
-        margin-bottom: 6px;
-      }
-      .legend {
-        margin-top: 10px;
-      }
-      .legend-item {
-        display: flex;
-        align-items: center;
-        gap: 8px;
-        margin-bottom: 6px;
-        cursor: pointer;
-      }
-      .legend-swatch {
-        width: 12px;
-        height: 12px;
-        border-radius: 3px;
-        border: 1px solid #e5e7eb;
-      }
-      .title {
-        font: 700 18px/1.2 Arial, sans-serif;
-        margin-bottom: 8px;
-      }
-      .tooltip {
-        position: absolute;
-        pointer-events: none;
-        background: #111827;
-        color: #f9fafb;
-        padding: 8px 10px;
-        border-radius: 8px;
-        font: 12px/1.2 Arial, sans-serif;
-        opacity: 0;
-      }
-      .axis text {
-        font: 12px Arial, sans-serif;
-        fill: #374151;
-      }
-      .axis path,
-      .axis line {
-        stroke: #cbd5e1;
-      }
-    </style>
-  </head>
-  <body>
-    <div class="chart-wrap">
-      <div class="title">Top Rated Movies: Rating vs Popularity</div>
-      <svg id="chart" width="100%" height="700" viewBox="0 0 900 700"></svg>
-      <div class="info-row">
-        <div class="info-card">
-          <div class="side-title">Movie Details (click a point)</div>
-          <div id="details">
-            Click a point to pin a movie here.
-          </div>
-        </div>
-        <div class="info-card">
-          <div class="side-title">Year Groups</div>
-          <div id="legend" class="legend"></div>
-        </div>
-      </div>
-    </div>
-    <div id="tooltip" class="tooltip"></div>
-    <script>
-      const data = __DATA__;
-      const svg = d3.select("#chart");
-      const width = 900;
-      const height = 700;
-      const margin = { top: 30, right: 24, bottom: 60, left: 70 };
-      const innerW = width - margin.left - margin.right;
-      const innerH = height - margin.top - margin.bottom;
-
-      const g = svg.append("g").attr("transform", `translate(${margin.left},${margin.top})`);
-
-      const x = d3.scaleLinear()
-        .domain(d3.extent(data, d => d.vote_average))
-        .nice()
-        .range([0, innerW]);
-
-      const y = d3.scaleLinear()
-        .domain(d3.extent(data, d => d.popularity))
-        .nice()
-        .range([innerH, 0]);
-
-      const r = d3.scaleSqrt()
-        .domain(d3.extent(data, d => d.vote_count))
-        .range([3, 18]);
-
-      const bins = Array.from(new Set(data.map(d => d.year_bin_label))).sort();
-      const c = d3.scaleOrdinal()
-        .domain(bins)
-        .range(d3.schemeTableau10.concat(d3.schemeSet3).slice(0, bins.length));
-
-      const details = d3.select("#details");
-      function renderDetails(d) {
-        details.html(
-          `<div class="detail-row"><strong>${d.title}</strong></div>` +
-          `<div class="detail-row">Year: ${d.release_year}</div>` +
-          `<div class="detail-row">Group: ${d.year_bin_label}</div>` +
-          `<div class="detail-row">Rating: ${d.vote_average.toFixed(2)}</div>` +
-          `<div class="detail-row">Popularity: ${d.popularity.toFixed(2)}</div>` +
-          `<div class="detail-row">Votes: ${d.vote_count}</div>`
-        );
-      }
-
-      g.append("g").attr("class", "axis")
-        .attr("transform", `translate(0,${innerH})`)
-        .call(d3.axisBottom(x));
-
-      g.append("g").attr("class", "axis")
-        .call(d3.axisLeft(y));
-
-      g.append("text")
-        .attr("x", innerW / 2)
-        .attr("y", innerH + 45)
-        .attr("text-anchor", "middle")
-        .attr("fill", "#111827")
-        .style("font", "13px Arial, sans-serif")
-        .text("Average Rating");
-
-      g.append("text")
-        .attr("transform", "rotate(-90)")
-        .attr("x", -innerH / 2)
-        .attr("y", -50)
-        .attr("text-anchor", "middle")
-        .attr("fill", "#111827")
-        .style("font", "13px Arial, sans-serif")
-        .text("Popularity");
-
-      const tooltip = d3.select("#tooltip");
-      let activeGroup = null;
-
-      const circles = g.selectAll("circle")
-        .data(data)
-        .enter()
-        .append("circle")
-        .attr("cx", d => x(d.vote_average))
-        .attr("cy", d => y(d.popularity))
-        .attr("r", d => r(d.vote_count))
-        .attr("fill", d => c(d.year_bin_label))
-        .attr("fill-opacity", 0.85)
-        .attr("stroke", "#111827")
-        .attr("stroke-opacity", 0.2)
-        .style("cursor", "pointer")
-        .on("click", (event, d) => {
-          renderDetails(d);
-        })
-        .on("mousemove", (event, d) => {
-          tooltip
-            .style("opacity", 1)
-            .style("left", (event.pageX + 12) + "px")
-            .style("top", (event.pageY - 28) + "px")
-            .html(
-              `<strong>${d.title}</strong><br/>` +
-              `Year: ${d.release_year}<br/>` +
-              `Group: ${d.year_bin_label}<br/>` +
-              `Rating: ${d.vote_average.toFixed(2)}<br/>` +
-              `Popularity: ${d.popularity.toFixed(2)}<br/>` +
-              `Votes: ${d.vote_count}`
-            );
-        })
-        .on("mouseleave", () => {
-          tooltip.style("opacity", 0);
-        });
-
-      const legend = d3.select("#legend");
-      const legendItems = legend.selectAll("div")
-        .data(bins)
-        .enter()
-        .append("div")
-        .attr("class", "legend-item");
-
-      legendItems.append("span")
-        .attr("class", "legend-swatch")
-        .style("background", d => c(d));
-
-      legendItems.append("span")
-        .text(d => d);
-
-      function updateOpacity() {
-        circles
-          .attr("fill-opacity", d => !activeGroup ? 0.85 : (d.year_bin_label === activeGroup ? 0.9 : 0.12))
-          .attr("stroke-opacity", d => !activeGroup ? 0.2 : (d.year_bin_label === activeGroup ? 0.5 : 0.1));
-        legendItems.style("opacity", d => !activeGroup ? 1 : (d === activeGroup ? 1 : 0.35));
-      }
-
-      legendItems.on("click", (event, d) => {
-        activeGroup = activeGroup === d ? null : d;
-        updateOpacity();
-      });
-
-    </script>
-  </body>
-</html>
-"""
+    # The search box and the pinned movie live in the chart; both come back
+    # as part of the component value.
+    chart_state = st.session_state.get("hw2_scatter") or {}
+    query = chart_state.get("query", "")
+    pinned = chart_state.get("pinned")
+    with stage("search") as info:
+        highlights = _search_hits(snapshot, query, year_range, min_votes, bin_size)
+        info["rows"] = len(highlights or [])
+    if highlights is None:
+        _await_search()
+        highlights = []
+
+    with stage("similar") as info:
+        similar = _similar_rows(snapshot, pinned, bin_size)
+        info["rows"] = len(similar or [])
+    if similar is None:
+        _await_similar(pinned)
+
+    with stage("skyline") as info:
+        ranked = load_standouts(snapshot, snapshot.version, year_range, min_votes, layers)
+        standouts = _chart_rows(
+            snapshot, ranked["key"].to_numpy(), bin_size, layer=ranked["layer"].to_numpy()
+        )
+        info["rows"] = len(standouts)
+
+    if density:
+        with stage("aggregate") as info:
+            cells, extent, matched = load_density(
+                snapshot, snapshot.version, year_range, min_votes, bin_size
+            )
+            info["rows"] = matched
+            info["cells"] = len(cells)
+        with stage("serialize") as info:
+            payload = _density_payload(cells)
+            info["bytes"] = payload["payload_bytes"]
+        with stage("component"):
+            _scatter(
+                payload_id=payload["payload_id"],
+                base=None,
+                mode="density",
+                layout=payload["layout"],
+                buffer=payload["buffer"],
+                extent=list(extent),
+                cell_radius=HEX_RADIUS,
+                query=query,
+                highlights=highlights,
+                standouts=standouts,
+                similar=similar,
+                similar_for=pinned,
+                d3_url=asset_url("d3"),
+                key="hw2_scatter",
+                default=None,
+            )
+        _render_tables(snapshot, year_range, min_votes, bin_size, standouts)
+        return
+
+    with stage("query") as info:
+        index = snapshot.index
+        positions, matched = index.query(year_range, min_votes, max_points)
+        info["rows"] = matched
+
+    with stage("take"):
+        filtered = df.take(positions)
+        filtered["year_bin_label"] = index.bin_labels(bin_size, positions)
+
+    with stage("serialize") as info:
+        payload = _scatter_payload(filtered, bin_size, snapshot.stats["lineage"])
+        info["rows_sent"] = payload["rows_sent"]
+        info["bytes"] = payload["payload_bytes"]
+
+    # Until the iframe reports its chart drawn it stays collapsed, and the
+    # page shows a static SVG of the chart here instead: rendered by the
+    # server, it needs no script, and it stays if D3 never loads.
+    first_paint = st.empty()
+    with stage("component"):
+        value = _scatter(
+            payload_id=payload["payload_id"],
+            base=payload["base"],
+            mode="points",
+            layout=payload["layout"],
+            buffer=payload["buffer"],
+            renderer=renderer,
+            svg_limit=SVG_POINT_LIMIT,
+            query=query,
+            highlights=highlights,
+            standouts=standouts,
+            similar=similar,
+            similar_for=pinned,
+            d3_url=asset_url("d3"),
+            key="hw2_scatter",
+            default=None,
+        )
+    if not (value or {}).get("drawn") and len(filtered) <= SVG_POINT_LIMIT:
+        with stage("first_paint") as info:
+            svg = load_first_paint(
+                filtered, snapshot.version, year_range, min_votes, max_points, bin_size
+            )
+            info["bytes"] = len(svg)
+        first_paint.markdown(
+            f'<svg width="100%" viewBox="0 0 900 700">{svg}</svg>', unsafe_allow_html=True
+        )
+    need_full = (value or {}).get("need_full")
+    if need_full is not None and need_full != st.session_state.get("_hw2_full_sent_for"):
+        # The iframe could not apply a delta (it was remounted or skipped a
+        # render); rerun the view once with every row.
+        st.session_state["_hw2_full_sent_for"] = need_full
+        st.session_state.pop("_hw2_sent", None)
+        st.rerun(scope="fragment")
+    _render_tables(snapshot, year_range, min_votes, bin_size, standouts)
+
+
+def _search_hits(
+    snapshot: Snapshot, query: str, year_range: tuple[int, int], min_votes: int, bin_size: int
+) -> list[dict[str, Any]] | None:
+    """Movies matching the search box within the current filter.
+
+    Matches are not limited to the top-N cut, so the chart can highlight a
+    movie it would not otherwise draw. None while the first search index is
+    built.
+    """
+    if not query.strip():
+        return []
+    search = snapshot.search
+    if search is None:
+        return None
+    df = snapshot.frame
+    years = df["release_year"].to_numpy()
+    votes = df["vote_count"].to_numpy()
+
+    def keep(positions: np.ndarray) -> np.ndarray:
+        year = years[positions]
+        in_range = (year >= year_range[0]) & (year <= year_range[1])
+        return in_range & (votes[positions] >= min_votes)
+
+    positions = search.search(query, snapshot.index.ranks, limit=SEARCH_LIMIT, keep=keep)
+    return _chart_rows(snapshot, positions, bin_size)
+
+
+def _similar_rows(
+    snapshot: Snapshot, pinned: int | None, bin_size: int
+) -> list[dict[str, Any]] | None:
+    """Movies whose overviews are most like the pinned movie's.
+
+    One row of the precomputed similar-movies table. None while the table
+    does not cover the movie yet, so the chart can say it is still indexing.
+    """
+    if pinned is None or not 0 <= pinned < len(snapshot.frame):
+        return []
+    table = snapshot.similar
+    if table is None or pinned >= len(table):
+        return None
+    positions, scores = table.lookup(pinned)
+    return _chart_rows(snapshot, positions, bin_size, similarity=scores)
+
+
+@st.fragment(run_every=INDEX_POLL_SECONDS)
+def _await_search() -> None:
+    """Rerun the view once the search index is ready (see _await_similar)."""
+    if load_live().snapshot().search is not None:
+        st.rerun(scope="app")
+
+
+@st.fragment(run_every=INDEX_POLL_SECONDS)
+def _await_similar(pinned: int) -> None:
+    """Rerun the view once the similar-movies table covers ``pinned``.
+
+    The table is built in the background, and nothing else would rerun the
+    view when it lands. Renders nothing, and is gone from the page with the
+    rerun that no longer needs it.
+    """
+    table = load_live().snapshot().similar
+    if table is not None and pinned < len(table):
+        # The view is a fragment of its own; "app" reaches past this one.
+        st.rerun(scope="app")
+
+
+def _chart_rows(
+    snapshot: Snapshot, positions: np.ndarray, bin_size: int, **extra: np.ndarray
+) -> list[dict[str, Any]]:
+    """Rows shaped like the ones the chart decodes, plus ``extra`` columns.
+
+    Used for the few rows that travel as plain JSON next to the binary
+    payload (search matches, standouts, similar movies).
+    """
+    df = snapshot.frame
+    columns = {
+        "key": positions,
+        "title": df["title"].to_numpy()[positions],
+        "release_year": df["release_year"].to_numpy()[positions],
+        "vote_average": df["vote_average"].to_numpy()[positions],
+        "popularity": df["popularity"].to_numpy()[positions],
+        "vote_count": df["vote_count"].to_numpy()[positions],
+        "year_bin_label": np.asarray(snapshot.index.bin_labels(bin_size, positions)),
+        **extra,
+    }
+    # tolist() turns numpy scalars into plain Python values for JSON.
+    values = [np.asarray(column).tolist() for column in columns.values()]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def _render_tables(
+    snapshot: Snapshot,
+    year_range: tuple[int, int],
+    min_votes: int,
+    bin_size: int,
+    standouts: list[dict[str, Any]],
+) -> None:
+    if standouts:
+        st.markdown("**Standout movies**")
+        st.dataframe(
+            pd.DataFrame(standouts)[
+                ["layer", "title", "release_year", "vote_average", "popularity", "vote_count"]
+            ],
+            hide_index=True,
+            column_config={
+                "layer": st.column_config.NumberColumn("Layer"),
+                "title": st.column_config.TextColumn("Title"),
+                "release_year": st.column_config.NumberColumn("Year", format="%d"),
+                "vote_average": st.column_config.NumberColumn("Rating", format="%.2f"),
+                "popularity": st.column_config.NumberColumn("Popularity", format="%.2f"),
+                "vote_count": st.column_config.NumberColumn("Votes", format="localized"),
+            },
+        )
+    _render_summary(snapshot, year_range, min_votes, bin_size)
+
+
+def _render_summary(
+    snapshot: Snapshot, year_range: tuple[int, int], min_votes: int, bin_size: int
+) -> None:
+    """Per-year-group statistics for the current filter, from the rollup."""
+    with stage("summary") as info:
+        summary = snapshot.rollup.summary(year_range, min_votes, bin_size)
+        info["rows"] = len(summary)
+    st.markdown("**Year-group summary**")
+    st.dataframe(
+        summary,
+        hide_index=True,
+        column_config={
+            "Mean rating": st.column_config.NumberColumn(format="%.2f"),
+            "Median rating": st.column_config.NumberColumn(
+                format="%.2f", help="Interpolated from a rating histogram, within 0.1."
+            ),
+            "Mean popularity": st.column_config.NumberColumn(format="%.2f"),
+            "Total votes": st.column_config.NumberColumn(format="localized"),
+        },
+    )
 
-    html = html.replace("__DATA__", data_json)
-    components.html(html, height=1050)
+
+def _next_payload_id() -> int:
+    # Ids keep increasing even after a forced full send, so the iframe never
+    # mistakes a new payload for one it already applied.
+    payload_id = st.session_state.get("_hw2_payload_seq", -1) + 1
+    st.session_state["_hw2_payload_seq"] = payload_id
+    return payload_id
+
+
+def _scatter_payload(filtered: pd.DataFrame, bin_size: int, lineage: str) -> dict[str, Any]:
+    """Rows to ship to the scatter component, as a delta when possible.
+
+    The component keeps the rows it has received, keyed by the frame index,
+    so a rerun only sends rows it does not hold yet plus the ordered list of
+    keys to display. Changing the year grouping relabels every row, and a
+    rebuilt (not appended-to) dataset renumbers them, so both force a full
+    send. Columns travel as one binary buffer (see
+    ColumnEncoder), which Streamlit passes to the iframe as raw bytes.
+    """
+    keys = filtered.index.to_numpy()
+    sent = st.session_state.get("_hw2_sent")
+    if sent is not None and sent["bin_size"] == bin_size and sent["lineage"] == lineage:
+        base = sent["payload_id"]
+        new_rows = filtered.loc[~filtered.index.isin(sent["keys"])]
+    else:
+        base = None
+        new_rows = filtered
+    payload_id = _next_payload_id()
+
+    encoder = encode_rows(keys, new_rows)
+
+    st.session_state["_hw2_sent"] = {
+        "payload_id": payload_id,
+        "bin_size": bin_size,
+        "lineage": lineage,
+        "keys": keys,
+    }
+    return {
+        "payload_id": payload_id,
+        "base": base,
+        "rows_sent": len(new_rows),
+        "layout": encoder.layout,
+        "buffer": encoder.buffer(),
+        "payload_bytes": encoder.payload_bytes(),
+    }
+
+
+def _density_payload(cells: pd.DataFrame) -> dict[str, Any]:
+    """Aggregate cells for the scatter component, always sent in full.
+
+    The iframe drops its cached rows when it draws cells, so the next points
+    payload has to be a full send as well.
+    """
+    st.session_state.pop("_hw2_sent", None)
+    encoder = ColumnEncoder()
+    encoder.numeric("x", cells["x"], "float32")
+    encoder.numeric("y", cells["y"], "float32")
+    encoder.numeric("count", cells["count"], "int32")
+    encoder.numeric("mean_votes", cells["mean_votes"], "float32")
+    encoder.dictionary("year_bin_label", cells["year_bin_label"])
+    return {
+        "payload_id": _next_payload_id(),
+        "layout": encoder.layout,
+        "buffer": encoder.buffer(),
+        "payload_bytes": encoder.payload_bytes(),
+    }
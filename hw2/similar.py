@@ -0,0 +1,195 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from hw2.tokens import tokenize
+
+# Neighbours kept per movie.
+TOP_K = 8
+# Words used by fewer than MIN_DF movies cannot link two of them, and words
+# in more than MAX_DF of all movies ("the", "his", "young") say little about
+# any one while dominating the cost of scoring; both are left out.
+MIN_DF = 2
+MAX_DF = 0.1
+# Past this many movies a word is left out as well, whatever the table's
+# size. Every kept word then links each of its movies to at most
+# MAX_POSTINGS others, which keeps the number of candidate pairs, and so the
+# build, linear in the number of (movie, word) entries.
+MAX_POSTINGS = 500
+# Movies are scored in blocks of rows producing at most about BLOCK_PAIRS
+# candidate (movie, movie, shared word) entries; smaller blocks sort faster
+# per entry. A block summed densely is summed at most BLOCK_CELLS
+# (movie, movie) cells at a time.
+BLOCK_PAIRS = 1 << 18
+BLOCK_CELLS = 1 << 22
+# A block's entries are summed into a dense rows x n matrix when they fill
+# at least this share of it, and otherwise sorted and summed per touched
+# cell. Sorting costs far more per entry than a dense bincount, so the dense
+# path wins well before the matrix fills up.
+DENSE_FILL = 1 / 16
+# Resolution of the scores when sorted as part of an integer key.
+_SCORE_STEPS = 1 << 32
+
+
+class SimilarMovies:
+    """Top-k "similar movies" table over the overview text.
+
+    Each overview becomes a TF-IDF vector (sublinear term frequency, smoothed
+    idf, L2-normalized) and each movie's TOP_K nearest neighbours by cosine
+    similarity are found once, up front. Looking up a movie's neighbours is
+    then one row of the table.
+
+    Neighbours are frame positions; -1 pads rows with fewer than TOP_K
+    movies sharing a word.
+    """
+
+    def __init__(self, neighbors: np.ndarray, scores: np.ndarray) -> None:
+        self.neighbors = neighbors
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.neighbors)
+
+    def lookup(self, position: int) -> tuple[np.ndarray, np.ndarray]:
+        """Frame positions and similarities of the movies most like ``position``."""
+        if not 0 <= position < len(self.neighbors):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        neighbors = self.neighbors[position]
+        keep = neighbors >= 0
+        return neighbors[keep].astype(np.int64), self.scores[position][keep]
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, k: int = TOP_K) -> "SimilarMovies":
+        """Score every movie against the movies it shares a kept word with.
+
+        Each block of rows expands its words into their postings, one entry
+        per (row, other movie, shared word), and sums the entries per pair.
+        Pairs sharing no kept word are never touched, so the work follows
+        the number of entries, not n². Each (movie, word) entry expands to
+        at most MAX_POSTINGS of them, which bounds the build linearly in the
+        number of movies; on small tables, where MAX_DF is the tighter
+        limit, most pairs of movies may still share a word.
+        """
+        n = len(df)
+        neighbors = np.full((n, k), -1, dtype=np.int32)
+        scores = np.zeros((n, k), dtype=np.float32)
+        if n < 2:
+            return cls(neighbors, scores)
+
+        rows, codes, vocab = tokenize(df["overview"])
+        # Term counts per (word, movie), sorted by word and then movie.
+        pairs, counts = np.unique(codes * n + rows, return_counts=True)
+        terms, docs = pairs // n, pairs % n
+        doc_freq = np.bincount(terms, minlength=len(vocab))
+        max_df = min(MAX_DF * n, MAX_POSTINGS)
+        kept = ((doc_freq >= MIN_DF) & (doc_freq <= max_df))[terms]
+        terms, docs, counts = terms[kept], docs[kept], counts[kept]
+
+        idf = np.log((1 + n) / (1 + doc_freq)) + 1
+        weights = (1 + np.log(counts)) * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights**2, minlength=n))
+        weights /= norms[docs]
+
+        # The same entries by word (postings) and by movie (vectors).
+        term_starts = np.searchsorted(terms, np.arange(len(vocab) + 1))
+        by_doc = np.argsort(docs, kind="stable")
+        doc_terms, doc_weights = terms[by_doc], weights[by_doc]
+        doc_starts = np.searchsorted(docs[by_doc], np.arange(n + 1))
+        # Cut the rows into blocks by the entries they expand to.
+        expansion = np.bincount(
+            docs, weights=term_starts[terms + 1] - term_starts[terms], minlength=n
+        )
+        cuts = np.searchsorted(
+            np.cumsum(expansion), np.arange(BLOCK_PAIRS, expansion.sum(), BLOCK_PAIRS)
+        )
+        cuts = np.unique(cuts[(cuts > 0) & (cuts < n)]).tolist()
+
+        k = min(k, n - 1)
+        for lo, hi in zip([0, *cuts], [*cuts, n]):
+            start, end = doc_starts[lo], doc_starts[hi]
+            if start == end:
+                continue
+            term = doc_terms[start:end]
+            local = np.repeat(np.arange(hi - lo), np.diff(doc_starts[lo : hi + 1]))
+            # Expand every entry of the block into the postings of its word.
+            lengths = term_starts[term + 1] - term_starts[term]
+            offsets = np.repeat(term_starts[term] - (np.cumsum(lengths) - lengths), lengths)
+            posting = offsets + np.arange(lengths.sum())
+            row = np.repeat(local, lengths)
+            cell = row * n + docs[posting]
+            value = np.repeat(doc_weights[start:end], lengths) * weights[posting]
+            if len(cell) >= DENSE_FILL * (hi - lo) * n:
+                # Summed densely BLOCK_CELLS cells at a time; the entries come
+                # ordered by row, so each run of rows is one slice of them.
+                step = max(1, BLOCK_CELLS // n)
+                spans = [(first, min(first + step, hi)) for first in range(lo, hi, step)]
+                slices = np.searchsorted(row, [(first - lo, last - lo) for first, last in spans])
+                results = [
+                    _top_dense(cell[i:j] - (first - lo) * n, value[i:j], first, last, n, k)
+                    for (first, last), (i, j) in zip(spans, slices)
+                ]
+            else:
+                spans = [(lo, hi)]
+                results = [_top_sparse(cell, value, lo, hi, n, k)]
+            for (first, last), (top, top_scores) in zip(spans, results):
+                top[top_scores <= 0] = -1
+                neighbors[first:last, :k] = top
+                scores[first:last, :k] = top_scores
+        return cls(neighbors, scores)
+
+    def save(self, path: str) -> None:
+        """Write the table to ``path`` atomically."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                np.savez(f, neighbors=self.neighbors, scores=self.scores)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarMovies":
+        with np.load(path) as saved:
+            return cls(saved["neighbors"], saved["scores"])
+
+
+def _top_dense(
+    cell: np.ndarray, value: np.ndarray, lo: int, hi: int, n: int, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Best k per row of the block, summing into a (hi - lo) x n matrix."""
+    block_scores = np.bincount(cell, weights=value, minlength=(hi - lo) * n)
+    block_scores = block_scores.reshape(hi - lo, n)
+    block_scores[np.arange(hi - lo), np.arange(lo, hi)] = 0.0
+
+    top = np.argpartition(-block_scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(block_scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def _top_sparse(
+    cell: np.ndarray, value: np.ndarray, lo: int, hi: int, n: int, k: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Best k per row of the block, summing only the cells it touches."""
+    cells, inverse = np.unique(cell, return_inverse=True)
+    sums = np.bincount(inverse, weights=value, minlength=len(cells))
+    rows, others = cells // n, cells % n
+    keep = others != rows + lo
+    rows, others, sums = rows[keep], others[keep], sums[keep]
+
+    # By row, then score descending (packed into one integer key; cells
+    # are already sorted, so ties stay by position). Each row's first k are
+    # its best.
+    key = rows * _SCORE_STEPS + ((1 - np.clip(sums, 0, 1)) * (_SCORE_STEPS - 1)).astype(np.int64)
+    order = np.argsort(key, kind="stable")
+    rows, others, sums = rows[order], others[order], sums[order]
+    rank = np.arange(len(rows)) - np.searchsorted(rows, rows)
+    best = rank < k
+    top = np.full((hi - lo, k), -1, dtype=np.int64)
+    top_scores = np.zeros((hi - lo, k))
+    top[rows[best], rank[best]] = others[best]
+    top_scores[rows[best], rank[best]] = sums[best]
+    return top, top_scores
@@ -0,0 +1,40 @@
+import numpy as np
+
+
+def skyline_layers(x: np.ndarray, y: np.ndarray, layers: int) -> np.ndarray:
+    """Pareto layer of each point when maximizing both ``x`` and ``y``.
+
+    Layer 0 is the skyline: points no other point beats on one axis without
+    losing on the other. Layer 1 is the skyline of the rest, and so on.
+    Points past the first ``layers`` layers get -1.
+
+    One O(n log n) sort by x (descending) and then y (descending) is done
+    up front. In that order a point is on the current skyline exactly when
+    its y beats every y before it, so each layer is one running-maximum pass
+    over what remains. Identical points share a layer.
+    """
+    n = len(x)
+    result = np.full(n, -1, dtype=np.int8)
+    if n == 0 or layers <= 0:
+        return result
+
+    order = np.lexsort((-y, -x))
+    xs, ys = x[order], y[order]
+    duplicate = np.zeros(n, dtype=bool)
+    duplicate[1:] = (xs[1:] == xs[:-1]) & (ys[1:] == ys[:-1])
+    group = np.cumsum(~duplicate) - 1
+    unique_y = ys[~duplicate]
+
+    unique_layer = np.full(len(unique_y), -1, dtype=np.int8)
+    remaining = np.arange(len(unique_y))
+    for layer in range(layers):
+        if not len(remaining):
+            break
+        rest_y = unique_y[remaining]
+        best_before = np.maximum.accumulate(np.concatenate(([-np.inf], rest_y[:-1])))
+        front = rest_y > best_before
+        unique_layer[remaining[front]] = layer
+        remaining = remaining[~front]
+
+    result[order] = unique_layer[group]
+    return result
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+from hw2.density import PLOT_HEIGHT, PLOT_WIDTH
+from static_svg import CATEGORY_COLORS, axis_bottom, axis_left, linear, nice, tick_format, ticks
+
+# The scatter's margins inside its 900x700 viewBox (see frontend/index.html).
+MARGIN_LEFT = 70
+MARGIN_TOP = 30
+# Point radii, as the chart's sqrt scale over vote_count.
+RADIUS_RANGE = (3.0, 18.0)
+
+
+def scatter_svg(rows: pd.DataFrame) -> str:
+    """Markup for the scatter's <svg>, drawn as the chart draws ``rows``.
+
+    Covers the axes, axis titles and points; the page shows it until the
+    iframe has loaded D3 and drawn the live chart.
+    """
+    ratings = rows["vote_average"].to_numpy(dtype=np.float64)
+    popularity = rows["popularity"].to_numpy(dtype=np.float64)
+    votes = rows["vote_count"].to_numpy(dtype=np.float64)
+
+    parts = [f'<g transform="translate({MARGIN_LEFT},{MARGIN_TOP})">']
+    if len(rows):
+        x0, x1 = nice(float(ratings.min()), float(ratings.max()))
+        y0, y1 = nice(float(popularity.min()), float(popularity.max()))
+        x = linear((x0, x1), (0, PLOT_WIDTH))
+        y = linear((y0, y1), (PLOT_HEIGHT, 0))
+        x_ticks = ticks(x0, x1, 10)
+        y_ticks = ticks(y0, y1, 10)
+        x_label = tick_format(x0, x1, 10)
+        y_label = tick_format(y0, y1, 10)
+        parts.append(
+            axis_bottom(x, x_ticks, [x_label(v) for v in x_ticks], (0, PLOT_WIDTH), PLOT_HEIGHT)
+        )
+        parts.append(
+            axis_left([y(v) for v in y_ticks], [y_label(v) for v in y_ticks], (PLOT_HEIGHT, 0))
+        )
+    parts.append(
+        f'<text x="{PLOT_WIDTH / 2}" y="{PLOT_HEIGHT + 45}" text-anchor="middle" fill="#111827" '
+        'style="font: 13px Arial, sans-serif">Average Rating</text>'
+        f'<text transform="rotate(-90)" x="{-PLOT_HEIGHT / 2}" y="-50" text-anchor="middle" '
+        'fill="#111827" style="font: 13px Arial, sans-serif">Popularity</text>'
+    )
+
+    if len(rows):
+        px = x(ratings)
+        py = y(popularity)
+        root = np.sqrt(votes)
+        radius = linear((root.min(), root.max()), RADIUS_RANGE)(root)
+        radius = np.broadcast_to(radius, root.shape)
+        labels = rows["year_bin_label"].astype(str).tolist()
+        colors = {
+            label: CATEGORY_COLORS[i % len(CATEGORY_COLORS)]
+            for i, label in enumerate(sorted(set(labels)))
+        }
+        fills = [colors[label] for label in labels]
+        parts.append('<g fill-opacity="0.85" stroke="#111827" stroke-opacity="0.2">')
+        parts.extend(
+            f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{r:.1f}" fill="{fill}"></circle>'
+            for cx, cy, r, fill in zip(px.tolist(), py.tolist(), radius.tolist(), fills)
+        )
+        parts.append("</g>")
+    parts.append("</g>")
+    return "".join(parts)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Runs of anything but letters, digits and underscore separate words, so the
+# words are the ones Python's \w+ finds. Splitting runs in Arrow (RE2), over
+# the whole column at once.
+SEPARATOR = r"[^\pL\pN_]+"
+
+
+def tokenize(text: pd.Series) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Every lower-cased word of ``text``, as (rows, codes, vocab).
+
+    ``rows`` holds the position of the value each word came from, ascending,
+    and ``codes`` its index into ``vocab``, the sorted distinct words.
+    Missing values have no words.
+    """
+    values = pa.array(text)
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    lists = pc.split_pattern_regex(pc.utf8_lower(values), SEPARATOR)
+    words = pc.list_flatten(lists)
+    keep = pc.not_equal(words, "")
+    rows = pc.list_parent_indices(lists).filter(keep).to_numpy().astype(np.int64)
+
+    encoded = pc.dictionary_encode(words.filter(keep))
+    vocab = np.asarray(encoded.dictionary.to_pylist(), dtype=str)
+    # Renumber words in sorted order.
+    order = np.argsort(vocab)
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    codes = remap[encoded.indices.to_numpy()] if len(order) else np.empty(0, dtype=np.int64)
+    return rows, codes, vocab[order]
+
+
+def split_words(text: str) -> list[str]:
+    """The lower-cased words of one string, in order, split as tokenize does."""
+    words = pc.split_pattern_regex(pc.utf8_lower(pa.array([text])), SEPARATOR)[0].as_py()
+    return [word for word in words if word]
@@ -0,0 +1,57 @@
+import itertools
+
+import numpy as np
+
+MIN_DIMENSIONS = 3
+MAX_DIMENSIONS = 10
+# Axis names, in order; past the usual X, Y, Z, W they count back from the
+# end of the alphabet.
+AXES = "XYZWVUTSRQ"
+
+
+def vertices(dims: int) -> np.ndarray:
+    """The 2**dims corners of the [-1, 1] hypercube, as int8 rows.
+
+    Coordinate k of vertex i is +1 where bit k of i is set and -1 where it
+    is clear.
+    """
+    bits = (np.arange(1 << dims)[:, None] >> np.arange(dims)) & 1
+    return (bits * 2 - 1).astype(np.int8)
+
+
+def edges(dims: int) -> np.ndarray:
+    """The dims * 2**(dims - 1) edges, as rows of two vertex indices.
+
+    Two corners share an edge when they differ in exactly one coordinate,
+    i.e. their indices differ in one bit: every vertex with bit k clear
+    pairs with the one that has it set.
+    """
+    ids = np.arange(1 << dims)
+    pairs = []
+    for k in range(dims):
+        low = ids[(ids >> k) & 1 == 0]
+        pairs.append(np.stack([low, low | (1 << k)], axis=1))
+    return np.concatenate(pairs).astype(np.uint16)
+
+
+def planes(dims: int) -> list[tuple[int, int]]:
+    """Every coordinate plane, as (first axis, second axis)."""
+    return list(itertools.combinations(range(dims), 2))
+
+
+def plane_name(plane: tuple[int, int]) -> str:
+    return f"{AXES[plane[0]]}-{AXES[plane[1]]}"
+
+
+def rotation(dims: int, angles: list[tuple[tuple[int, int], float]]) -> np.ndarray:
+    """The dims x dims matrix of the plane rotations in ``angles``, in order.
+
+    Rotating by ``angle`` in plane (a, b) turns axis a towards axis b.
+    """
+    matrix = np.eye(dims)
+    for (a, b), angle in angles:
+        c, s = np.cos(angle), np.sin(angle)
+        step = np.eye(dims)
+        step[a, a], step[a, b], step[b, a], step[b, b] = c, -s, s, c
+        matrix = step @ matrix
+    return matrix
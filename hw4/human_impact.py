@@ -5,6 +5,10 @@ import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as components
 
+import static_svg
+from assets import script_tag
+from perf import instrument, stage
+
 
 RAW_DATA = [
     {"Country": "Albania", "Military Deaths": "30,000", "Total Deaths": "30,200"},
@@ -181,6 +185,8 @@ def _load_df() -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
+@st.fragment
+@instrument("hw4")
 def render_hw4() -> None:
     st.subheader("Human Impact: WWII Death Estimates by Country")
     st.markdown(
@@ -193,7 +199,9 @@ def render_hw4() -> None:
 """
     )
 
-    df = _load_df()
+    with stage("load_data") as info:
+        df = _load_df()
+        info["rows"] = len(df)
 
     st.markdown("### Cinematic Growth View")
     st.caption(
@@ -260,27 +268,30 @@ def render_hw4() -> None:
         factor = 100.0 / pop
         return avg * factor, lo * factor, hi * factor
 
-    cinematic_df = df[
-        df["total_avg"].notna()
-        & df["military_avg"].notna()
-        & df["civilian_avg"].notna()
-    ].copy()
-    if narrative_mode != "Absolute deaths":
-        cinematic_df = cinematic_df[cinematic_df["pop_1939"].notna()].copy()
-
-    total_scaled = cinematic_df.apply(lambda r: scale_values(r, "total"), axis=1)
-    military_scaled = cinematic_df.apply(lambda r: scale_values(r, "military"), axis=1)
-    civilian_scaled = cinematic_df.apply(lambda r: scale_values(r, "civilian"), axis=1)
-
-    cinematic_df["total_scaled"] = [v[0] for v in total_scaled]
-    cinematic_df["total_scaled_min"] = [v[1] for v in total_scaled]
-    cinematic_df["total_scaled_max"] = [v[2] for v in total_scaled]
-    cinematic_df["military_scaled"] = [v[0] for v in military_scaled]
-    cinematic_df["military_scaled_min"] = [v[1] for v in military_scaled]
-    cinematic_df["military_scaled_max"] = [v[2] for v in military_scaled]
-    cinematic_df["civilian_scaled"] = [v[0] for v in civilian_scaled]
-    cinematic_df["civilian_scaled_min"] = [v[1] for v in civilian_scaled]
-    cinematic_df["civilian_scaled_max"] = [v[2] for v in civilian_scaled]
+    with stage("filter") as info:
+        cinematic_df = df[
+            df["total_avg"].notna()
+            & df["military_avg"].notna()
+            & df["civilian_avg"].notna()
+        ].copy()
+        if narrative_mode != "Absolute deaths":
+            cinematic_df = cinematic_df[cinematic_df["pop_1939"].notna()].copy()
+        info["rows"] = len(cinematic_df)
+
+    with stage("scale_apply"):
+        total_scaled = cinematic_df.apply(lambda r: scale_values(r, "total"), axis=1)
+        military_scaled = cinematic_df.apply(lambda r: scale_values(r, "military"), axis=1)
+        civilian_scaled = cinematic_df.apply(lambda r: scale_values(r, "civilian"), axis=1)
+
+        cinematic_df["total_scaled"] = [v[0] for v in total_scaled]
+        cinematic_df["total_scaled_min"] = [v[1] for v in total_scaled]
+        cinematic_df["total_scaled_max"] = [v[2] for v in total_scaled]
+        cinematic_df["military_scaled"] = [v[0] for v in military_scaled]
+        cinematic_df["military_scaled_min"] = [v[1] for v in military_scaled]
+        cinematic_df["military_scaled_max"] = [v[2] for v in military_scaled]
+        cinematic_df["civilian_scaled"] = [v[0] for v in civilian_scaled]
+        cinematic_df["civilian_scaled_min"] = [v[1] for v in civilian_scaled]
+        cinematic_df["civilian_scaled_max"] = [v[2] for v in civilian_scaled]
 
     focus_col = {
         "total": "total_scaled",
@@ -288,38 +299,42 @@ def render_hw4() -> None:
         "civilian": "civilian_scaled",
     }[focus_key]
 
-    cinematic_df = cinematic_df[cinematic_df[focus_col].notna()].copy()
-    cinematic_df = (
-        cinematic_df.sort_values(focus_col, ascending=False)
-        .head(cinematic_n)
-        .sort_values(focus_col, ascending=True)
-        .copy()
-    )
-    cinematic_df["metric_value"] = cinematic_df[focus_col]
-    cinematic_rows = cinematic_df[
-        [
-            "country",
-            "metric_value",
-            "pop_1939",
-            "total_scaled",
-            "total_scaled_min",
-            "total_scaled_max",
-            "military_avg",
-            "military_scaled",
-            "civilian_avg",
-            "civilian_scaled",
-            "total_avg",
-            "military_scaled_min",
-            "military_scaled_max",
-            "civilian_scaled_min",
-            "civilian_scaled_max",
-            "military_range_label",
-            "total_range_label",
-            "civilian_range_label",
-        ]
-    ].to_dict(orient="records")
-    components.html(
-        _build_cinematic_html(
+    with stage("sort_top_n"):
+        cinematic_df = cinematic_df[cinematic_df[focus_col].notna()].copy()
+        cinematic_df = (
+            cinematic_df.sort_values(focus_col, ascending=False)
+            .head(cinematic_n)
+            .sort_values(focus_col, ascending=True)
+            .copy()
+        )
+        cinematic_df["metric_value"] = cinematic_df[focus_col]
+
+    with stage("to_dict"):
+        cinematic_rows = cinematic_df[
+            [
+                "country",
+                "metric_value",
+                "pop_1939",
+                "total_scaled",
+                "total_scaled_min",
+                "total_scaled_max",
+                "military_avg",
+                "military_scaled",
+                "civilian_avg",
+                "civilian_scaled",
+                "total_avg",
+                "military_scaled_min",
+                "military_scaled_max",
+                "civilian_scaled_min",
+                "civilian_scaled_max",
+                "military_range_label",
+                "total_range_label",
+                "civilian_range_label",
+            ]
+        ].to_dict(orient="records")
+
+    with stage("build_html") as info:
+        html = _build_cinematic_html(
             rows=cinematic_rows,
             metric_title=focus_title,
             step_ms=step_ms,
@@ -328,9 +343,110 @@ def render_hw4() -> None:
             pace_multiplier=pace_multiplier,
             city_unit=city_unit,
             realtime_sec_per_100k=realtime_sec_per_100k,
-        ),
-        height=920,
-    )
+        )
+        info["bytes"] = len(html)
+    components.html(html, height=920)
+
+
+# The cinematic chart's SVG layout (see _build_cinematic_html).
+CHART_WIDTH = 980
+CHART_HEIGHT = 600
+CHART_MARGIN = {"top": 22, "right": 18, "bottom": 32, "left": 190}
+BAND_PADDING = 0.16
+
+
+def _format_mode(value: float, narrative_mode: str) -> str:
+    if narrative_mode == "Absolute deaths":
+        return f"{value:,.0f}"
+    if narrative_mode == "Deaths per 100k people":
+        return f"{value:,.1f}"
+    return f"{value:.2f}%"
+
+
+def _format_tick(value: float) -> str:
+    # d3.format(","): grouped, no trailing zeros.
+    return f"{int(value):,}" if float(value).is_integer() else f"{value:,}"
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _static_chart(data_json: str, narrative_mode: str) -> str:
+    """The chart's finished state as SVG, drawn the way render() draws it.
+
+    It fills the chart before D3 has loaded, stays until the animation
+    starts, and is all a client without scripts sees. Cached by the rows
+    (which carry the data and every setting that shapes them) and the mode.
+    """
+    rows = sorted(json.loads(data_json), key=lambda d: d["metric_value"], reverse=True)
+    inner_w = CHART_WIDTH - CHART_MARGIN["left"] - CHART_MARGIN["right"]
+    inner_h = CHART_HEIGHT - CHART_MARGIN["top"] - CHART_MARGIN["bottom"]
+    parts = [
+        f'<g id="staticChart" transform="translate({CHART_MARGIN["left"]},{CHART_MARGIN["top"]})">'
+    ]
+    if rows:
+        max_value = max(d["total_scaled"] or 0 for d in rows) or 1
+        x = static_svg.linear((0, max_value * 1.08), (0, inner_w))
+        x_ticks = static_svg.ticks(0, max_value * 1.08, 6)
+        # d3.scaleBand().padding(BAND_PADDING), centred.
+        step = inner_h / max(1, len(rows) - BAND_PADDING + BAND_PADDING * 2)
+        top = (inner_h - step * (len(rows) - BAND_PADDING)) / 2
+        band = step * (1 - BAND_PADDING)
+        ys = [top + step * i for i in range(len(rows))]
+
+        max_military = max(d["military_scaled"] or 0 for d in rows) or 1
+        max_civilian = max(d["civilian_scaled"] or 0 for d in rows) or 1
+
+        parts.append(
+            static_svg.axis_bottom(
+                x, x_ticks, [_format_tick(v) for v in x_ticks], (0, inner_w), inner_h
+            )
+        )
+        parts.append(
+            static_svg.axis_left(
+                [y + band / 2 for y in ys], [d["country"] for d in rows], (0, inner_h)
+            )
+        )
+        parts.append('<g opacity="0.18">')
+        parts.extend(
+            f'<line x1="{x(t):.1f}" x2="{x(t):.1f}" y1="0" y2="{inner_h}" stroke="#cbd5e1"></line>'
+            for t in x_ticks
+        )
+        parts.append("</g>")
+        for d, y in zip(rows, ys):
+            total = d["total_scaled"] or 0
+            military = d["military_scaled"] or 0
+            middle = y + band / 2
+            low = d["total_scaled_min"] or total
+            high = d["total_scaled_max"] or total
+            parts.append(
+                f'<line class="uncertainty" x1="{x(low):.1f}" x2="{x(high):.1f}" '
+                f'y1="{middle:.1f}" y2="{middle:.1f}"></line>'
+                f'<rect x="0" y="{y:.1f}" width="{x(military):.1f}" height="{band:.1f}" rx="5" '
+                f'fill="{static_svg.mix("#fdba74", "#b91c1c", military / max_military)}" '
+                'opacity="0.92"></rect>'
+                f'<rect x="{x(military):.1f}" y="{y:.1f}" '
+                f'width="{max(0.0, x(total) - x(military)):.1f}" height="{band:.1f}" '
+                f'fill="{static_svg.mix("#93c5fd", "#4338ca", (d["civilian_scaled"] or 0) / max_civilian)}" '
+                'opacity="0.9"></rect>'
+                f'<text class="bar-label" x="{x(total) + 8:.1f}" y="{middle + 4:.1f}">'
+                f"{static_svg.text(_format_mode(total, narrative_mode))}</text>"
+            )
+    parts.append("</g>")
+    return "".join(parts)
+
+
+def _finished_panel(rows: list[dict[str, Any]], narrative_mode: str) -> dict[str, str]:
+    """Side-panel text for the finished chart, matching updateSidePanel()."""
+
+    def total(key: str) -> float:
+        return sum(d[key] or 0 for d in rows)
+
+    return {
+        "cumulative": _format_mode(total("total_scaled"), narrative_mode),
+        "military": _format_mode(total("military_scaled"), narrative_mode),
+        "civilian": _format_mode(total("civilian_scaled"), narrative_mode),
+        "progress": f"Progress: {len(rows)} / {len(rows)} countries | "
+        f"absolute cumulative: {total('total_avg'):,.0f}",
+    }
 
 
 def _build_cinematic_html(
@@ -343,19 +459,26 @@ def _build_cinematic_html(
     city_unit: int,
     realtime_sec_per_100k: float,
 ) -> str:
-    data_json = json.dumps(rows)
+    with stage("json_dumps") as info:
+        data_json = json.dumps(rows)
+        info["bytes"] = len(data_json)
     title_json = json.dumps(metric_title)
     mode_json = json.dumps(narrative_mode)
     memorial_json = "true" if memorial_mode else "false"
     pace_json = json.dumps(float(pace_multiplier))
     city_unit_json = json.dumps(int(city_unit))
     realtime_pace_json = json.dumps(float(realtime_sec_per_100k))
+    with stage("static_chart") as info:
+        static_chart = _static_chart(data_json, narrative_mode)
+        info["bytes"] = len(static_chart)
+    # The panel starts out describing the static chart, so the two agree.
+    finished = _finished_panel(rows, narrative_mode)
     return f"""
 <!DOCTYPE html>
 <html>
   <head>
     <meta charset="utf-8" />
-    <script src="https://d3js.org/d3.v7.min.js"></script>
+    {script_tag("d3", defer=True)}
     <style>
       body {{
         margin: 0;
@@ -544,7 +667,7 @@ def _build_cinematic_html(
       </div>
       <div class="panel">
         <div class="chart-card">
-          <svg id="chart" width="100%" height="600" viewBox="0 0 980 600"></svg>
+          <svg id="chart" width="100%" height="600" viewBox="0 0 980 600">{static_chart}</svg>
         </div>
         <div class="info-card">
           <div class="kpi">
@@ -553,23 +676,23 @@ def _build_cinematic_html(
           </div>
           <div class="kpi">
             <div class="kpi-label">Cumulative Total</div>
-            <div id="cumulative" class="kpi-value">0</div>
+            <div id="cumulative" class="kpi-value">{finished["cumulative"]}</div>
           </div>
           <div class="kpi">
             <div class="kpi-label">Cumulative Military</div>
-            <div id="cumulativeMilitary" class="kpi-value" style="color:#f97316">0</div>
+            <div id="cumulativeMilitary" class="kpi-value" style="color:#f97316">{finished["military"]}</div>
           </div>
           <div class="kpi">
             <div class="kpi-label">Cumulative Civilian</div>
-            <div id="cumulativeCivilian" class="kpi-value" style="color:#38bdf8">0</div>
+            <div id="cumulativeCivilian" class="kpi-value" style="color:#38bdf8">{finished["civilian"]}</div>
           </div>
           <div class="kpi">
             <div class="kpi-label">Current Country</div>
             <div id="countryName" class="country">-</div>
           </div>
-          <div id="countryMeta" class="meta">Press Play to start animation.</div>
+          <div id="countryMeta" class="meta">All countries shown. Press Play to build the chart up one country at a time.</div>
           <div id="cityEq" class="meta"></div>
-          <div id="progress" class="progress"></div>
+          <div id="progress" class="progress">{finished["progress"]}</div>
           <div class="meta" style="margin-top:12px;">
             <strong style="color:#f97316">Military</strong> + <strong style="color:#38bdf8">Civilian</strong> = Total
           </div>
@@ -581,7 +704,9 @@ def _build_cinematic_html(
       <div class="memorial-total" id="memorialTotal"></div>
       <div class="memorial-quote">"Every number was a life. Every life was a world."</div>
     </div>
-    <script>
+    <!-- A module script runs after the deferred D3 script, once the page,
+         static chart included, has been parsed and painted. -->
+    <script type="module">
       const allData = {data_json};
       const metricTitle = {title_json};
       const narrativeMode = {mode_json};
@@ -971,7 +1096,20 @@ def _build_cinematic_html(
         updateSidePanel(lastItem);
       }}
 
+      // The server-drawn finished chart, and the side panel the server filled
+      // in to match it, stay up until the animation starts from the first
+      // country.
+      function clearStaticChart() {{
+        const staticChart = document.getElementById("staticChart");
+        if (!staticChart) return;
+        // Faded rather than cut, as the first country's bar grows in.
+        staticChart.removeAttribute("id");
+        d3.select(staticChart).transition().duration(400).attr("opacity", 0).remove();
+        countryMetaEl.textContent = "Press Play to start animation.";
+      }}
+
       function step() {{
+        clearStaticChart();
         if (idx >= allData.length) {{
           pause();
           return null;
@@ -1020,6 +1158,7 @@ def _build_cinematic_html(
       }}
 
       function restart() {{
+        clearStaticChart();
         pause();
         hideMemorial();
         particleG.selectAll("*").remove();
@@ -1035,7 +1174,9 @@ def _build_cinematic_html(
       document.getElementById("pauseBtn").addEventListener("click", pause);
       document.getElementById("restartBtn").addEventListener("click", restart);
 
-      render();
+      if (!document.getElementById("staticChart")) {{
+        render();
+      }}
     </script>
   </body>
 </html>
@@ -0,0 +1,210 @@
+import collections
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+_PANEL_KEY = "_perf_panel"
+_PROFILE_SWITCH_KEY = "_perf_profile_switch"
+_PROFILE_LEFT_KEY = "_perf_profile_left"
+_PROFILES_KEY = "_perf_profiles"
+
+# Seconds between stack samples while profiling, and how many captured
+# profiles a session keeps for download.
+PROFILE_INTERVAL = 0.001
+MAX_PROFILES = 10
+
+# Each session reruns its script in its own thread, so the stages of the
+# rerun in progress are kept per thread.
+_local = threading.local()
+
+
+def debug_enabled() -> bool:
+    """True when ?debug=1 is in the URL or VIZ_DEBUG=1 is set."""
+    return os.environ.get("VIZ_DEBUG") == "1" or st.query_params.get("debug") == "1"
+
+
+def _profile_switch() -> str:
+    """Number of reruns to profile, from ?profile=N or VIZ_PROFILE=N."""
+    return st.query_params.get("profile") or os.environ.get("VIZ_PROFILE", "")
+
+
+def _arm_profiler() -> bool:
+    """Consume one profiled rerun, re-arming whenever the switch changes."""
+    switch = _profile_switch()
+    if switch != st.session_state.get(_PROFILE_SWITCH_KEY):
+        st.session_state[_PROFILE_SWITCH_KEY] = switch
+        st.session_state[_PROFILE_LEFT_KEY] = int(switch) if switch.isdigit() else 0
+    left = st.session_state.get(_PROFILE_LEFT_KEY, 0)
+    if left <= 0:
+        return False
+    st.session_state[_PROFILE_LEFT_KEY] = left - 1
+    return True
+
+
+class StackSampler:
+    """Sample one thread's Python stack on a timer.
+
+    Samples are kept as folded stacks ("root;caller;leaf count" lines), the
+    input format of flamegraph.pl, speedscope and most flamegraph viewers.
+    """
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                )
+                frame = frame.f_back
+            if names:
+                self.counts[";".join(reversed(names))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def attach_panel(placeholder: Any) -> None:
+    """Remember the sidebar placeholder the views report their timings into.
+
+    Views run as fragments, which cannot open the sidebar themselves, so the
+    app creates the placeholder and views write into it on every rerun.
+    """
+    st.session_state[_PANEL_KEY] = placeholder
+
+
+@contextmanager
+def stage(name: str) -> Iterator[dict[str, Any]]:
+    """Time a block as one stage of the current rerun.
+
+    The yielded dict is logged with the stage, e.g. ``info["bytes"] = n``.
+    """
+    info: dict[str, Any] = {}
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        stages = getattr(_local, "stages", None)
+        if stages is not None:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stages.append({"stage": name, "ms": round(elapsed_ms, 3), **info})
+
+
+def instrument(view: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Collect a view's stages for one rerun, then log them and fill the panel.
+
+    While the profile switch is armed, the rerun also runs under a
+    StackSampler and its profile is offered for download below the view.
+    """
+
+    def decorator(func: Callable[..., None]) -> Callable[..., None]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> None:
+            _local.stages = []
+            sampler = StackSampler(threading.get_ident()) if _arm_profiler() else None
+            start = time.perf_counter()
+            try:
+                if sampler is None:
+                    func(*args, **kwargs)
+                else:
+                    with sampler:
+                        func(*args, **kwargs)
+            finally:
+                stages = _local.stages
+                _local.stages = None
+                total_ms = (time.perf_counter() - start) * 1000
+                _report(view, stages, total_ms)
+                if sampler is not None:
+                    _store_profile(view, sampler)
+            _render_profile_downloads()
+
+        return wrapper
+
+    return decorator
+
+
+def _report(view: str, stages: list[dict[str, Any]], total_ms: float) -> None:
+    logger.info(
+        json.dumps({"event": "rerun", "view": view, "total_ms": round(total_ms, 3), "stages": stages})
+    )
+
+    panel = st.session_state.get(_PANEL_KEY)
+    if panel is None:
+        return
+    lines = [
+        f"**Stage timings: {view}**",
+        "",
+        "| Stage | ms | Detail |",
+        "| --- | ---: | --- |",
+    ]
+    for row in stages:
+        detail = ", ".join(
+            f"{key}={value:,}" if type(value) is int else f"{key}={value}"
+            for key, value in row.items()
+            if key not in {"stage", "ms"}
+        )
+        lines.append(f"| {row['stage']} | {row['ms']:.1f} | {detail} |")
+    lines.append(f"| **total** | **{total_ms:.1f}** | |")
+    panel.markdown("\n".join(lines))
+
+
+def _store_profile(view: str, sampler: StackSampler) -> None:
+    profiles = st.session_state.setdefault(_PROFILES_KEY, [])
+    profiles.append(
+        {
+            "view": view,
+            "captured": time.strftime("%Y%m%d-%H%M%S"),
+            "samples": sum(sampler.counts.values()),
+            "folded": sampler.folded(),
+        }
+    )
+    del profiles[:-MAX_PROFILES]
+    logger.info(
+        json.dumps({"event": "profile", "view": view, "samples": profiles[-1]["samples"]})
+    )
+
+
+def _render_profile_downloads() -> None:
+    profiles = st.session_state.get(_PROFILES_KEY)
+    if not profiles:
+        return
+    with st.expander(f"Captured profiles ({len(profiles)})"):
+        st.caption(
+            "Folded stacks: open in speedscope.app or pipe into flamegraph.pl. "
+            f"{st.session_state.get(_PROFILE_LEFT_KEY, 0)} profiled reruns left."
+        )
+        for i, profile in enumerate(reversed(profiles)):
+            name = f"{profile['view']}-{profile['captured']}"
+            st.download_button(
+                f"{name} ({profile['samples']:,} samples)",
+                data=profile["folded"],
+                file_name=f"{name}.folded.txt",
+                mime="text/plain",
+                key=f"_perf_profile_{len(profiles) - i}",
+            )
@@ -0,0 +1,154 @@
+"""Server-side SVG for first paint, mirroring what the D3 charts draw.
+
+The charts show this markup at once, and keep it if their scripts never
+run. The helpers follow D3's own scale and tick arithmetic (d3.ticks,
+linear.nice, axisBottom/axisLeft), so swapping in the live chart moves
+nothing.
+"""
+
+import math
+from collections.abc import Callable, Sequence
+from html import escape
+
+# d3.schemeTableau10 followed by d3.schemeSet3, the hw2 year-group palette.
+CATEGORY_COLORS = (
+    "#4e79a7 #f28e2c #e15759 #76b7b2 #59a14f #edc949 #af7aa1 #ff9da7 #9c755f #bab0ab "
+    "#8dd3c7 #ffffb3 #bebada #fb8072 #80b1d3 #fdb462 #b3de69 #fccde5 #d9d9d9 #bc80bd "
+    "#ccebc5 #ffed6f"
+).split()
+
+_E10, _E5, _E2 = math.sqrt(50), math.sqrt(10), math.sqrt(2)
+
+
+def _tick_spec(start: float, stop: float, count: float) -> tuple[int, int, float]:
+    step = (stop - start) / max(0, count)
+    power = math.floor(math.log10(step))
+    error = step / 10**power
+    factor = 10 if error >= _E10 else 5 if error >= _E5 else 2 if error >= _E2 else 1
+    if power < 0:
+        inc = 10**-power / factor
+        i1, i2 = round(start * inc), round(stop * inc)
+        if i1 / inc < start:
+            i1 += 1
+        if i2 / inc > stop:
+            i2 -= 1
+        inc = -inc
+    else:
+        inc = 10**power * factor
+        i1, i2 = round(start / inc), round(stop / inc)
+        if i1 * inc < start:
+            i1 += 1
+        if i2 * inc > stop:
+            i2 -= 1
+    if i2 < i1 and 0.5 <= count < 2:
+        return _tick_spec(start, stop, count * 2)
+    return i1, i2, inc
+
+
+def tick_step(start: float, stop: float, count: int) -> float:
+    """d3.tickIncrement: negative values mean 1 / -step."""
+    if stop <= start or count <= 0:
+        return 0.0
+    return _tick_spec(start, stop, count)[2]
+
+
+def ticks(start: float, stop: float, count: int) -> list[float]:
+    """d3.ticks for an ascending domain."""
+    if count <= 0:
+        return []
+    if start == stop:
+        return [start]
+    i1, i2, inc = _tick_spec(start, stop, count)
+    if i2 < i1:
+        return []
+    if inc < 0:
+        return [(i1 + i) / -inc for i in range(i2 - i1 + 1)]
+    return [(i1 + i) * inc for i in range(i2 - i1 + 1)]
+
+
+def nice(start: float, stop: float, count: int = 10) -> tuple[float, float]:
+    """linear.nice(): widen [start, stop] to round tick values."""
+    previous = None
+    for _ in range(10):
+        step = tick_step(start, stop, count)
+        if step == previous:
+            break
+        if step > 0:
+            start, stop = math.floor(start / step) * step, math.ceil(stop / step) * step
+        elif step < 0:
+            start, stop = math.ceil(start * step) / step, math.floor(stop * step) / step
+        else:
+            break
+        previous = step
+    return start, stop
+
+
+def tick_format(start: float, stop: float, count: int) -> Callable[[float], str]:
+    """The default linear tickFormat: grouped, fixed to the tick precision."""
+    inc = tick_step(start, stop, count)
+    step = -1 / inc if inc < 0 else inc
+    digits = max(0, -math.floor(math.log10(step))) if step > 0 else 0
+    return lambda value: f"{value:,.{digits}f}".replace("-", "−")
+
+
+def linear(domain: Sequence[float], output: Sequence[float]) -> Callable[[float], float]:
+    d0, d1 = domain
+    r0, r1 = output
+    span = d1 - d0
+    if span == 0:
+        return lambda value: (r0 + r1) / 2
+    return lambda value: r0 + (value - d0) / span * (r1 - r0)
+
+
+def mix(low: str, high: str, t: float) -> str:
+    """d3.interpolateRgb between two #rrggbb colors, clamped."""
+    t = min(max(t, 0.0), 1.0)
+    a = [int(low[i : i + 2], 16) for i in (1, 3, 5)]
+    b = [int(high[i : i + 2], 16) for i in (1, 3, 5)]
+    r, g, bl = (round(x + (y - x) * t) for x, y in zip(a, b))
+    return f"rgb({r}, {g}, {bl})"
+
+
+def text(value: object) -> str:
+    return escape(str(value), quote=True)
+
+
+def axis_bottom(
+    scale: Callable[[float], float],
+    values: Sequence[float],
+    labels: Sequence[str],
+    extent: tuple[float, float],
+    y: float,
+) -> str:
+    """A d3.axisBottom at vertical offset ``y`` (the caller's class applies)."""
+    parts = [
+        f'<g class="axis" transform="translate(0,{y:.1f})" fill="none" font-size="10" '
+        f'font-family="sans-serif" text-anchor="middle">',
+        f'<path class="domain" stroke="currentColor" d="M{extent[0]:.1f},6V0H{extent[1]:.1f}V6"></path>',
+    ]
+    for value, label in zip(values, labels):
+        parts.append(
+            f'<g class="tick" transform="translate({scale(value):.1f},0)">'
+            f'<line stroke="currentColor" y2="6"></line>'
+            f'<text fill="currentColor" y="9" dy="0.71em">{text(label)}</text></g>'
+        )
+    parts.append("</g>")
+    return "".join(parts)
+
+
+def axis_left(
+    positions: Sequence[float], labels: Sequence[str], extent: tuple[float, float]
+) -> str:
+    """A d3.axisLeft with ticks at the given pixel ``positions``."""
+    parts = [
+        '<g class="axis" fill="none" font-size="10" font-family="sans-serif" text-anchor="end">',
+        f'<path class="domain" stroke="currentColor" d="M-6,{extent[0]:.1f}H0V{extent[1]:.1f}H-6"></path>',
+    ]
+    for position, label in zip(positions, labels):
+        parts.append(
+            f'<g class="tick" transform="translate(0,{position:.1f})">'
+            f'<line stroke="currentColor" x2="-6"></line>'
+            f'<text fill="currentColor" x="-9" dy="0.32em">{text(label)}</text></g>'
+        )
+    parts.append("</g>")
+    return "".join(parts)
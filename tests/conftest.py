@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from hw2 import dataset
+from tests.movies import COLUMNS
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """Path of an empty source CSV, with the cache in a private directory.
+
+    Chunks are small so that appends and builds span several row groups.
+    """
+    monkeypatch.setattr(dataset, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(dataset, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(dataset, "CHUNK_ROWS", 7)
+    monkeypatch.setattr(dataset, "EXPECTED_SHA256", "")
+    os.makedirs(dataset.DATA_DIR)
+    path = os.path.join(dataset.DATA_DIR, dataset.SOURCE_NAME)
+    with open(path, "w") as f:
+        f.write(COLUMNS + "\n")
+    return path
+
@@ -0,0 +1,41 @@
+"""Small TMDB-shaped movie CSVs and frames for the tests."""
+
+import numpy as np
+import pandas as pd
+
+from hw2.dataset import compact
+
+COLUMNS = "id,title,overview,release_date,popularity,vote_average,vote_count"
+
+
+def movie_lines(start: int, count: int) -> list[str]:
+    """CSV rows for movies ``start`` .. ``start + count - 1``, newline-terminated."""
+    return [
+        f'{i},Movie {i},"A story, number {i}, about word{i % 7}",'
+        f"{1990 + i % 30}-0{1 + i % 9}-1{i % 9},{1.5 + i % 11:.1f},{5 + (i % 50) / 10:.1f},{10 + i}\n"
+        for i in range(start, start + count)
+    ]
+
+
+def append(path: str, text: str) -> None:
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def movie_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A cached-style frame of random movies, with the compact dtypes.
+
+    Years, vote counts and one-decimal ratings are drawn from small ranges,
+    so ties are common.
+    """
+    rng = np.random.default_rng(seed)
+    return compact(
+        pd.DataFrame(
+            {
+                "release_year": rng.integers(1990, 2010, rows),
+                "vote_count": rng.integers(0, 1000, rows),
+                "vote_average": rng.integers(0, 101, rows) / 10,
+                "popularity": np.round(rng.exponential(20.0, rows), 1),
+            }
+        )
+    )
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import assets
+
+
+@pytest.fixture
+def unvendored(monkeypatch):
+    monkeypatch.setattr(assets, "_manifest", lambda: {})
+
+
+@pytest.fixture
+def vendor_dir(tmp_path, monkeypatch):
+    """A private vendor directory holding every library, and its manifest."""
+    manifest = {}
+    for name, url in assets.LIBRARIES.items():
+        content = f"/* {name} */".encode()
+        manifest[name] = assets.hashed_name(url, content)
+        (tmp_path / manifest[name]).write_bytes(content)
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    monkeypatch.setattr(assets, "VENDOR_DIR", str(tmp_path))
+    monkeypatch.setattr(assets, "_manifest", lambda: manifest)
+    assets.check_vendored.cache_clear()
+    yield tmp_path
+    assets.check_vendored.cache_clear()
+
+
+def test_missing_library_is_an_error(unvendored, monkeypatch):
+    monkeypatch.setattr(assets, "ALLOW_CDN", False)
+    with pytest.raises(FileNotFoundError, match="vendor_assets.py"):
+        assets.asset_url("d3")
+    assets.check_vendored.cache_clear()
+    with pytest.raises(FileNotFoundError, match="d3, three not vendored"):
+        assets.check_vendored()
+
+
+def test_cdn_only_when_allowed(unvendored, monkeypatch):
+    monkeypatch.setattr(assets, "ALLOW_CDN", True)
+    assert assets.asset_url("three") == assets.LIBRARIES["three"]
+    assets.check_vendored.cache_clear()
+    assets.check_vendored()
+
+
+def test_vendored_files_are_checked(vendor_dir):
+    assets.check_vendored()
+
+    name = assets._manifest()["three"]
+    (vendor_dir / name).write_bytes(b"tampered")
+    assets.check_vendored.cache_clear()
+    with pytest.raises(ValueError, match="does not match its hash"):
+        assets.check_vendored()
+
+    (vendor_dir / name).unlink()
+    with pytest.raises(FileNotFoundError, match="is missing"):
+        assets.check_vendored()
+
+
+def test_vendored_url_is_relative_and_hashed(monkeypatch):
+    monkeypatch.setattr(assets, "_manifest", lambda: {"d3": "d3.v7.min.0123456789ab.js"})
+    assert assets.asset_url("d3") == "component/assets.vendor/d3.v7.min.0123456789ab.js"
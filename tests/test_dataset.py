@@ -0,0 +1,129 @@
+import os
+
+import pandas as pd
+import pandas.testing as tm
+import pyarrow.parquet as pq
+
+from hw2 import dataset
+from tests.movies import append, movie_lines
+
+
+def parsed(path: str) -> pd.DataFrame:
+    """The source parsed in one go, as a full build would."""
+    return dataset.parse_chunk(pd.read_csv(path))
+
+
+def test_build_keeps_last_line_without_newline(source):
+    append(source, "".join(movie_lines(0, 50)).rstrip("\n"))
+    cached = dataset.ensure_cache()
+    assert len(dataset.read_cache(cached)) == 50
+    assert dataset.read_stats(cached)["rows"] == 50
+
+
+def test_append_parses_only_new_rows(source, monkeypatch):
+    append(source, "".join(movie_lines(0, 20)))
+    first = dataset.ensure_cache()
+    before = dataset.read_stats(first)
+
+    starts = []
+    read_chunks = dataset._read_chunks
+
+    def recording(path, start, end, names=None):
+        starts.append(start)
+        return read_chunks(path, start, end, names)
+
+    monkeypatch.setattr(dataset, "_read_chunks", recording)
+    append(source, "".join(movie_lines(20, 15)))
+    cached = dataset.ensure_cache()
+    stats = dataset.read_stats(cached)
+
+    assert cached != first
+    assert starts == [before["source_bytes"]]
+    assert stats["lineage"] == before["lineage"]
+    assert stats["rows"] == 35
+    # The new part holds the new rows alone; the first stays as it was.
+    assert dataset.cache_parts(cached) == [first, cached]
+    assert pq.read_metadata(cached).num_rows == 15
+    tm.assert_frame_equal(dataset.read_cache(cached), parsed(source), check_dtype=False)
+
+
+def test_appended_parts_are_merged(source, monkeypatch):
+    monkeypatch.setattr(dataset, "MAX_PARTS", 3)
+    append(source, "".join(movie_lines(0, 10)))
+    first = dataset.ensure_cache()
+    for i in range(4):
+        append(source, "".join(movie_lines(10 + 5 * i, 5)))
+        cached = dataset.ensure_cache()
+
+    parts = dataset.cache_parts(cached)
+    # Two appended parts were merged into the third append's, then the
+    # fourth append got its own.
+    assert parts[0] == first and len(parts) == 3
+    assert pq.read_metadata(parts[1]).num_rows == 15
+    names = {os.path.basename(part) for part in parts}
+    assert {name for name in os.listdir(dataset.CACHE_DIR) if name.endswith(".parquet")} == names
+    tm.assert_frame_equal(dataset.read_cache(cached), parsed(source), check_dtype=False)
+    # Every append still starts on a row group boundary.
+    assert dataset.read_rows(cached, 25) is not None
+
+
+def test_append_holds_back_partial_line(source):
+    append(source, "".join(movie_lines(0, 10)))
+    dataset.ensure_cache()
+    complete, partial = movie_lines(10, 3), movie_lines(13, 1)[0]
+    append(source, "".join(complete) + partial[:12])
+
+    cached = dataset.ensure_cache()
+    assert dataset.read_stats(cached)["rows"] == 13
+
+    append(source, partial[12:])
+    cached = dataset.ensure_cache()
+    stats = dataset.read_stats(cached)
+    assert stats["rows"] == 14
+    tm.assert_frame_equal(dataset.read_cache(cached), parsed(source), check_dtype=False)
+
+
+def test_append_after_unterminated_build_rebuilds(source):
+    append(source, "".join(movie_lines(0, 10)).rstrip("\n"))
+    lineage = dataset.read_stats(dataset.ensure_cache())["lineage"]
+    # The next writer starts a new line: the old last row is left intact.
+    append(source, "\n" + "".join(movie_lines(10, 5)))
+
+    previous = dataset._previous_cache(source)
+    assert dataset.append_cache(source, previous) is None
+    cached = dataset.ensure_cache()
+    stats = dataset.read_stats(cached)
+    assert stats["lineage"] != lineage
+    assert stats["rows"] == 15
+
+
+def test_rewritten_source_rebuilds(source):
+    append(source, "".join(movie_lines(0, 10)))
+    first = dataset.read_stats(dataset.ensure_cache())
+    lines = open(source).readlines()
+    lines[1] = lines[1].replace("Movie 0", "Film 0")
+    with open(source, "w") as f:
+        f.writelines(lines + movie_lines(10, 2))
+
+    assert dataset.append_cache(source, dataset._previous_cache(source)) is None
+    cached = dataset.ensure_cache()
+    assert dataset.read_stats(cached)["lineage"] != first["lineage"]
+    assert len(os.listdir(dataset.CACHE_DIR)) == 1
+    tm.assert_frame_equal(dataset.read_cache(cached), parsed(source), check_dtype=False)
+
+
+def test_read_rows(source):
+    append(source, "".join(movie_lines(0, 10)))
+    dataset.ensure_cache()
+    append(source, "".join(movie_lines(10, 9)))
+    dataset.ensure_cache()
+    append(source, "".join(movie_lines(19, 4)))
+    cached = dataset.ensure_cache()
+    frame = dataset.read_cache(cached)
+
+    tail = dataset.read_rows(cached, 10)
+    tm.assert_frame_equal(tail, frame.iloc[10:].reset_index(drop=True))
+    assert dataset.read_rows(cached, len(frame)).empty
+    # 10 rows were written as groups of 7 and 3; 5 is inside the first.
+    assert dataset.read_rows(cached, 5) is None
+    assert dataset.read_rows(cached, 0) is not None
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from hw2.density import HEX_RADIUS, PLOT_HEIGHT, PLOT_WIDTH, hex_centers, hexbin
+from hw2.index import MovieIndex
+from tests.movies import movie_frame
+
+
+def test_points_go_to_the_nearest_center():
+    rng = np.random.default_rng(0)
+    radius = 12.0
+    px = rng.uniform(0, 800, 5000)
+    py = rng.uniform(0, 600, 5000)
+    cx, cy = hex_centers(px, py, radius)
+
+    # Every center of the lattice near the points, by brute force.
+    dx, dy = radius * np.sqrt(3), radius * 1.5
+    rows = np.arange(-1, 600 / dy + 2)
+    cols = np.arange(-1, 800 / dx + 2)
+    lx = ((cols[None, :] + (rows[:, None] % 2) / 2) * dx).ravel()
+    ly = np.repeat(rows * dy, len(cols))
+    nearest = ((px[:, None] - lx) ** 2 + (py[:, None] - ly) ** 2).min(axis=1)
+    np.testing.assert_allclose((px - cx) ** 2 + (py - cy) ** 2, nearest)
+
+
+def test_hexbin_matches_pandas():
+    df = movie_frame(3000)
+    index = MovieIndex(df)
+    positions = index.matches((1990, 2009), 200)
+    groups = index.bin_labels(10, positions)
+    cells, (x0, x1, y0, y1) = hexbin(df, positions, groups)
+
+    rows = df.iloc[positions]
+    assert (x0, x1) == (rows["vote_average"].min(), rows["vote_average"].max())
+    assert (y0, y1) == (rows["popularity"].min(), rows["popularity"].max())
+    assert cells["count"].sum() == len(positions)
+
+    px = (rows["vote_average"].to_numpy(np.float64) - x0) / (x1 - x0) * PLOT_WIDTH
+    py = (y1 - rows["popularity"].to_numpy(np.float64)) / (y1 - y0) * PLOT_HEIGHT
+    cx, cy = hex_centers(px, py, HEX_RADIUS)
+    points = pd.DataFrame(
+        {
+            "x": np.round(cx, 6),
+            "y": np.round(cy, 6),
+            "votes": rows["vote_count"].to_numpy(),
+            "group": groups,
+        }
+    )
+    expected = points.groupby(["x", "y"]).agg(
+        count=("votes", "size"), mean_votes=("votes", "mean")
+    )
+    # Most common year group per cell; ties go to the earliest group.
+    dominant = points.groupby(["x", "y"])["group"].agg(
+        lambda g: g.value_counts(sort=False).idxmax()
+    )
+    actual = cells.assign(x=np.round(cells["x"], 6), y=np.round(cells["y"], 6))
+    actual = actual.set_index(["x", "y"]).sort_index()
+    assert list(actual.index) == list(expected.index)
+    assert list(actual["count"]) == list(expected["count"])
+    np.testing.assert_allclose(actual["mean_votes"], expected["mean_votes"])
+    assert list(actual["year_bin_label"]) == list(dominant)
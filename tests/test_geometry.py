@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from hw3.geometry import (
+    MAX_DIMENSIONS,
+    MIN_DIMENSIONS,
+    edges,
+    plane_name,
+    planes,
+    rotation,
+    vertices,
+)
+
+DIMENSIONS = range(MIN_DIMENSIONS, MAX_DIMENSIONS + 1)
+
+
+@pytest.mark.parametrize("dims", DIMENSIONS)
+def test_vertices_are_the_distinct_corners(dims):
+    corners = vertices(dims)
+    assert corners.shape == (2**dims, dims)
+    assert set(np.unique(corners)) == {-1, 1}
+    assert len(np.unique(corners, axis=0)) == 2**dims
+
+
+@pytest.mark.parametrize("dims", DIMENSIONS)
+def test_edges_join_corners_one_coordinate_apart(dims):
+    corners = vertices(dims)
+    pairs = edges(dims).astype(np.int64)
+    assert pairs.shape == (dims * 2 ** (dims - 1), 2)
+    assert len(np.unique(np.sort(pairs, axis=1), axis=0)) == len(pairs)
+    hamming = (corners[pairs[:, 0]] != corners[pairs[:, 1]]).sum(axis=1)
+    assert (hamming == 1).all()
+    # Every corner has one edge per axis.
+    assert (np.bincount(pairs.ravel(), minlength=2**dims) == dims).all()
+
+
+@pytest.mark.parametrize("dims", DIMENSIONS)
+def test_rotation_preserves_norms(dims):
+    rng = np.random.default_rng(dims)
+    angles = [(plane, rng.uniform(-np.pi, np.pi)) for plane in planes(dims)]
+    matrix = rotation(dims, angles)
+    np.testing.assert_allclose(matrix @ matrix.T, np.eye(dims), atol=1e-12)
+
+    corners = vertices(dims).astype(np.float64)
+    turned = corners @ matrix.T
+    np.testing.assert_allclose(np.linalg.norm(turned, axis=1), np.sqrt(dims))
+    pairs = edges(dims).astype(np.int64)
+    lengths = np.linalg.norm(turned[pairs[:, 0]] - turned[pairs[:, 1]], axis=1)
+    np.testing.assert_allclose(lengths, 2.0)
+
+
+def test_rotation_turns_first_axis_towards_second():
+    matrix = rotation(4, [((0, 3), np.pi / 2)])
+    np.testing.assert_allclose(matrix @ np.eye(4)[0], np.eye(4)[3], atol=1e-12)
+    assert plane_name((0, 3)) == "X-W"
+    assert len(planes(4)) == 6
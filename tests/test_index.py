@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from hw2.index import MovieIndex
+from tests.movies import movie_frame
+
+
+@pytest.mark.parametrize(
+    "year_range, min_votes, max_points",
+    [
+        ((1990, 2009), 0, 50),
+        ((1995, 1999), 300, 20),
+        ((2003, 2003), 0, 10_000),
+        ((1980, 1989), 0, 10),
+        ((1990, 2009), 2000, 10),
+    ],
+)
+def test_query_matches_pandas(year_range, min_votes, max_points):
+    df = movie_frame(2000)
+    mask = df["release_year"].between(*year_range) & (df["vote_count"] >= min_votes)
+    expected = df[mask].sort_values("vote_count", ascending=False, kind="stable")
+
+    positions, matched = MovieIndex(df).query(year_range, min_votes, max_points)
+    assert matched == mask.sum()
+    assert list(positions) == list(expected.index[:max_points])
+
+
+def test_matches_is_the_whole_filter():
+    df = movie_frame(2000)
+    mask = df["release_year"].between(1993, 2001) & (df["vote_count"] >= 450)
+    positions = MovieIndex(df).matches((1993, 2001), 450)
+    assert sorted(positions) == list(np.flatnonzero(mask))
+
+
+def test_bin_labels():
+    df = movie_frame(500)
+    positions = np.arange(0, 500, 7)
+    years = df["release_year"].to_numpy()[positions]
+    labels = MovieIndex(df).bin_labels(5, positions)
+    assert list(labels) == [f"{y // 5 * 5}-{y // 5 * 5 + 4}" for y in years]
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from hw2 import dataset, live
+from tests.movies import append, movie_lines
+
+
+def _search_of(snapshot):
+    """The snapshot's own search index, once the background build is done."""
+    deadline = time.monotonic() + 10
+    while snapshot._search is None:
+        assert time.monotonic() < deadline, "search index never built"
+        time.sleep(0.01)
+    assert snapshot.search is snapshot._search
+    return snapshot.search
+
+
+def _next_snapshot(movies, current):
+    """The first snapshot after ``current``, once the refresh thread has it."""
+    deadline = time.monotonic() + 10
+    while (snapshot := movies.snapshot()) is current:
+        assert time.monotonic() < deadline, "source change never picked up"
+        time.sleep(0.01)
+    return snapshot
+
+
+def test_appended_rows_extend_the_snapshot(source, monkeypatch):
+    monkeypatch.setattr(live, "REFRESH_SECONDS", 0)
+    append(source, "".join(movie_lines(0, 12)))
+    movies = live.LiveMovies()
+    first = movies.snapshot()
+    _search_of(first)  # extended below
+
+    before = first.frame.copy()
+    append(source, "".join(movie_lines(12, 8)))
+    second = _next_snapshot(movies, first)
+    assert second.stats["lineage"] == first.stats["lineage"]
+    tm.assert_frame_equal(
+        second.frame, dataset.read_cache(dataset.ensure_cache()), check_dtype=False
+    )
+    tm.assert_frame_equal(first.frame, before)
+
+    # The first append grew the buffers to twice the rows; the next one
+    # fits, and is written past what the second frame sees.
+    before = second.frame.copy()
+    append(source, "".join(movie_lines(20, 3)))
+    third = _next_snapshot(movies, second)
+    assert len(third.frame) == 23
+    tm.assert_frame_equal(second.frame, before)
+    votes = second.frame["vote_count"].to_numpy()
+    assert np.shares_memory(votes, third.frame["vote_count"].to_numpy())
+    assert list(_search_of(second).search("movie 19", second.index.ranks)) == [19]
+
+
+def test_pinned_source_is_not_followed(source, monkeypatch, caplog):
+    monkeypatch.setattr(live, "REFRESH_SECONDS", 0)
+    monkeypatch.setattr(live, "FOLLOW_SOURCE", False)
+    append(source, "".join(movie_lines(0, 5)))
+    movies = live.LiveMovies()
+    first = movies.snapshot()
+
+    append(source, "".join(movie_lines(5, 5)))
+    assert movies.snapshot() is first
+    assert not caplog.records
+
+
+def test_refresh_runs_off_the_rerun(source, monkeypatch):
+    monkeypatch.setattr(live, "REFRESH_SECONDS", 0)
+    append(source, "".join(movie_lines(0, 5)))
+    movies = live.LiveMovies()
+    first = movies.snapshot()
+
+    threads = []
+    ensure_cache = live.ensure_cache
+
+    def recording():
+        threads.append(threading.current_thread().name)
+        return ensure_cache()
+
+    monkeypatch.setattr(live, "ensure_cache", recording)
+    append(source, "".join(movie_lines(5, 5)))
+    second = _next_snapshot(movies, first)
+    assert len(second.frame) == 10
+    assert set(threads) == {"hw2-refresh"}
+
+
+def test_frame_changes_stay_with_the_caller(source):
+    append(source, "".join(movie_lines(0, 5)))
+    snapshot = live.LiveMovies().snapshot()
+    before = snapshot.frame.copy()
+
+    df = snapshot.frame
+    with pytest.raises(ValueError, match="read-only"):
+        df["popularity"].to_numpy()[0] = 0.0
+    df["popularity"] *= 2
+    df.sort_values("title", ascending=False, inplace=True)
+    df["extra"] = 1
+    tm.assert_frame_equal(snapshot.frame, before)
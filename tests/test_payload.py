@@ -0,0 +1,107 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from hw2.payload import TYPED, ColumnEncoder, encode_rows
+
+
+def _decode(encoder: ColumnEncoder) -> dict:
+    """The columns as the chart script reads them (decodeColumns)."""
+    # The layout travels as JSON and the buffer as raw bytes.
+    layout = json.loads(json.dumps(encoder.layout))
+    buffer = encoder.buffer()
+    columns = {}
+    for spec in layout:
+        assert spec["offset"] % 4 == 0
+        values = np.frombuffer(buffer, TYPED[spec["type"]], spec["length"], spec["offset"])
+        if "values" in spec:
+            values = [spec["values"][code] for code in values]
+        columns[spec["name"]] = values
+    return columns
+
+
+def _rows(columns: dict) -> dict[int, dict]:
+    """Rows by key, as the chart script caches them (decodeRows)."""
+    names = [name for name in columns if name not in {"keys", "key"}]
+    return {
+        int(key): {name: columns[name][i] for name in names}
+        for i, key in enumerate(columns["key"])
+    }
+
+
+def _frame(index) -> pd.DataFrame:
+    n = len(index)
+    return pd.DataFrame(
+        {
+            "title": pd.array([f"Movie {i % 3}" for i in index], dtype="string[pyarrow]"),
+            "release_year": np.arange(1990, 1990 + n, dtype=np.int16),
+            "vote_average": np.linspace(1, 9, n),
+            "popularity": np.geomspace(0.5, 500, n),
+            "vote_count": np.arange(n, dtype=np.int32) * 1000,
+            "year_bin_label": [f"{1990 + 5 * (i // 5)}s" for i in range(n)],
+        },
+        index=index,
+    )
+
+
+def _expected(df: pd.DataFrame, key: int) -> dict:
+    row = df.loc[key]
+    return {
+        "title": row["title"],
+        "release_year": row["release_year"],
+        "vote_average": np.float32(row["vote_average"]),
+        "popularity": np.float32(row["popularity"]),
+        "vote_count": row["vote_count"],
+        "year_bin_label": row["year_bin_label"],
+    }
+
+
+def test_numeric_columns_round_trip():
+    encoder = ColumnEncoder()
+    ints = np.array([-(2**31), -1, 0, 7, 2**31 - 1])
+    floats = np.array([-1.5, 0.0, 3.25, 1e30, np.inf])
+    encoder.dictionary("label", pd.Series(list("abcab")))  # odd offsets after it
+    encoder.numeric("small", np.array([-(2**15), 0, 1, 2, 2**15 - 1]), "int16")
+    encoder.numeric("ints", ints, "int32")
+    encoder.numeric("floats", pd.Series(floats), "float32")
+
+    columns = _decode(encoder)
+    assert columns["small"].tolist() == [-(2**15), 0, 1, 2, 2**15 - 1]
+    assert columns["ints"].tolist() == ints.tolist()
+    assert columns["floats"].tolist() == floats.astype(np.float32).tolist()
+    assert encoder.payload_bytes() == len(encoder.buffer()) + len(json.dumps(encoder.layout))
+
+
+def test_missing_values_round_trip():
+    encoder = ColumnEncoder()
+    encoder.numeric("floats", np.array([np.nan, 1.0]), "float32")
+    encoder.dictionary("arrow", pd.Series(["a", None, "a"], dtype="string[pyarrow]"))
+    encoder.dictionary("object", pd.Series([np.nan, "b", None], dtype=object))
+
+    columns = _decode(encoder)
+    assert np.isnan(columns["floats"][0]) and columns["floats"][1] == 1.0
+    assert columns["arrow"] == ["a", None, "a"]
+    assert columns["object"] == [None, "b", None]
+
+
+def test_deltas_carry_their_own_dictionaries():
+    df = _frame(range(100, 130))
+    first_keys = df.index[:20].to_numpy()
+    first = encode_rows(first_keys, df.loc[first_keys])
+    cache = _rows(_decode(first))
+    assert list(_decode(first)["keys"]) == first_keys.tolist()
+
+    # The next view keeps some rows and adds others, whose titles reuse
+    # values the first payload's dictionary already had.
+    keys = df.index[10:30].to_numpy()
+    new_rows = df.loc[~df.index.isin(first_keys) & df.index.isin(keys)]
+    delta = encode_rows(keys, new_rows)
+    columns = _decode(delta)
+    title = next(spec for spec in delta.layout if spec["name"] == "title")
+    assert sorted(title["values"]) == sorted(set(new_rows["title"]))
+    assert list(columns["key"]) == new_rows.index.tolist()
+
+    cache.update(_rows(columns))
+    for key in columns["keys"]:
+        assert cache[int(key)] == _expected(df, int(key))
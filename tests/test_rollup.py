@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hw2.rollup import RATING_BINS, RATING_MAX, VOTE_STEP, YearRollup
+from tests.movies import movie_frame
+
+
+@pytest.mark.parametrize(
+    "year_range, min_votes, bin_size",
+    [((1990, 2009), 0, 5), ((1993, 2004), 250, 10), ((2000, 2000), 900, 5)],
+)
+def test_summary_matches_pandas(year_range, min_votes, bin_size):
+    df = movie_frame(5000)
+    # The rollup rounds the vote threshold down to its buckets.
+    threshold = min_votes // VOTE_STEP * VOTE_STEP
+    rows = df[df["release_year"].between(*year_range) & (df["vote_count"] >= threshold)]
+    group = rows["release_year"] // bin_size * bin_size
+    expected = rows.groupby(group).agg(
+        movies=("vote_count", "size"),
+        mean_rating=("vote_average", "mean"),
+        median_rating=("vote_average", "median"),
+        mean_popularity=("popularity", "mean"),
+        total_votes=("vote_count", "sum"),
+    )
+
+    summary = YearRollup(df).summary(year_range, min_votes, bin_size)
+    assert list(summary["Years"]) == [f"{s}-{s + bin_size - 1}" for s in expected.index]
+    assert list(summary["Movies"]) == list(expected["movies"])
+    assert list(summary["Total votes"]) == list(expected["total_votes"])
+    np.testing.assert_allclose(summary["Mean rating"], expected["mean_rating"], rtol=1e-6)
+    np.testing.assert_allclose(
+        summary["Mean popularity"], expected["mean_popularity"], rtol=1e-6
+    )
+    # The median is interpolated within one histogram bin, and the ratings
+    # sit on bin edges.
+    error = summary["Median rating"].to_numpy() - expected["median_rating"].to_numpy()
+    assert (error >= -1e-6).all() and (error < RATING_MAX / RATING_BINS).all()
+
+
+@pytest.mark.parametrize(
+    "ratings, median",
+    [
+        ([0.7, 0.7, 0.7], 0.7),
+        ([5.1, 5.1, 8.1], 5.1),
+        ([1.0, 5.0], 3.0),
+        ([2.0, 6.0, 6.0, 9.9], 6.0),
+    ],
+)
+def test_median_of_few_ratings(ratings, median):
+    df = pd.DataFrame(
+        {
+            "release_year": np.full(len(ratings), 2000, dtype=np.int16),
+            "vote_count": np.full(len(ratings), 10, dtype=np.int32),
+            "vote_average": np.array(ratings, dtype=np.float32),
+            "popularity": np.ones(len(ratings), dtype=np.float32),
+        }
+    )
+    got = YearRollup(df).summary((2000, 2000), 0, 5)["Median rating"].iloc[0]
+    assert median - 1e-6 <= got < median + RATING_MAX / RATING_BINS
+
+
+def test_empty_filter():
+    summary = YearRollup(movie_frame(100)).summary((1980, 1985), 0, 5)
+    assert summary.empty
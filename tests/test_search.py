@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hw2 import search
+from hw2.index import MovieIndex
+from hw2.search import SearchIndex
+from hw2.tokens import split_words
+
+WORDS = "the silent night river north northern norway nor star start stars".split()
+
+
+def _frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    def text(count: int) -> list[str]:
+        return [" ".join(rng.choice(WORDS, rng.integers(1, count))) for _ in range(rows)]
+
+    return pd.DataFrame(
+        {
+            "title": pd.array(text(4), dtype="string[pyarrow]"),
+            "overview": pd.array(text(8), dtype="string[pyarrow]"),
+            "vote_count": rng.integers(0, 50, rows).astype(np.int32),
+            "release_year": rng.integers(1990, 2000, rows).astype(np.int16),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def movies():
+    """A frame, its vote ranks and each movie's set of words."""
+    df = _frame(600)
+    words = [set(split_words(f"{t} {o}")) for t, o in zip(df["title"], df["overview"])]
+    return df, MovieIndex(df).ranks, words
+
+
+def _brute_force(df, words, query, ranks, limit, keep):
+    query = " ".join(query.lower().split())
+    tokens = split_words(query)
+    titles = df["title"].str.lower()
+
+    def has(row, i, token):
+        if i == len(tokens) - 1 and len(token) >= search.MIN_PREFIX:
+            return any(word.startswith(token) for word in words[row])
+        return token in words[row]
+
+    by_rank = list(np.argsort(ranks))
+    by_title = [p for p in by_rank if titles[p].startswith(query) and keep(p)]
+    by_words = [
+        p
+        for p in by_rank
+        if p not in by_title and keep(p) and all(has(p, i, t) for i, t in enumerate(tokens))
+    ]
+    return (by_title + by_words)[:limit]
+
+
+@pytest.mark.parametrize("query", ["the", "nor", "silent ni", "star", "night the sta", "x"])
+@pytest.mark.parametrize("limit", [5, 1000])
+def test_matches_brute_force(monkeypatch, movies, query, limit):
+    # Small windows, so a query walks several of them.
+    monkeypatch.setattr(search, "FIRST_WINDOW", 16)
+    df, ranks, words = movies
+    # Three segments: the first rows, then two appends.
+    index = SearchIndex(df.iloc[:400]).extended(df.iloc[:550]).extended(df)
+    years = df["release_year"].to_numpy()
+
+    def keep(positions):
+        return years[positions] >= 1994
+
+    found = index.search(query, ranks, limit=limit, keep=keep)
+    assert list(found) == _brute_force(df, words, query, ranks, limit, lambda p: years[p] >= 1994)
+
+
+def test_prefix_expansion_is_capped(monkeypatch, movies):
+    monkeypatch.setattr(search, "MAX_EXPANSIONS", 2)
+    df, _, words = movies
+    # "nor" stands for nor, norway, north and northern; only the two most
+    # used are looked up.
+    runs = SearchIndex(df)._segments[0]._runs("nor", prefix=True)
+    used = sorted((sum(w in row for row in words) for w in ("nor", "norway", "north", "northern")))
+    assert sorted(len(run) for run in runs) == used[-2:]
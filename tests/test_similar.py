@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hw2 import similar
+from hw2.similar import SimilarMovies
+from hw2.tokens import split_words
+
+
+def _overviews(rows: int, seed: int = 0) -> pd.DataFrame:
+    # Zipf-like word use: a few words too common to keep, many rare ones.
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"w{i}" for i in range(400)])
+    weights = 1 / np.arange(1, len(vocab) + 1)
+    text = [
+        " ".join(rng.choice(vocab, rng.integers(0, 12), p=weights / weights.sum()))
+        for _ in range(rows)
+    ]
+    return pd.DataFrame({"overview": pd.array(text, dtype="string[pyarrow]")})
+
+
+def _brute_force(df: pd.DataFrame) -> np.ndarray:
+    """Every pair's cosine similarity, from dense TF-IDF vectors."""
+    n = len(df)
+    words = [split_words(text) for text in df["overview"]]
+    vocab = sorted({word for row in words for word in row})
+    counts = np.zeros((n, len(vocab)))
+    for row, row_words in enumerate(words):
+        for word in row_words:
+            counts[row, vocab.index(word)] += 1
+
+    doc_freq = (counts > 0).sum(axis=0)
+    max_df = min(similar.MAX_DF * n, similar.MAX_POSTINGS)
+    kept = (doc_freq >= similar.MIN_DF) & (doc_freq <= max_df)
+    tf = np.where(counts > 0, 1 + np.log(np.maximum(counts, 1)), 0.0)
+    vectors = tf * (np.log((1 + n) / (1 + doc_freq)) + 1) * kept
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    cosine = vectors @ vectors.T
+    np.fill_diagonal(cosine, 0.0)
+    return cosine
+
+
+@pytest.mark.parametrize("path", ["sparse", "dense"])
+def test_matches_brute_force_top_k(monkeypatch, path):
+    df = _overviews(300)
+    # Several blocks, and dense blocks summed a few rows at a time.
+    monkeypatch.setattr(similar, "BLOCK_PAIRS", 2000)
+    monkeypatch.setattr(similar, "BLOCK_CELLS", 7 * len(df))
+    monkeypatch.setattr(similar, "DENSE_FILL", np.inf if path == "sparse" else 0.0)
+    table = SimilarMovies.build(df)
+    cosine = _brute_force(df)
+
+    for position in range(len(df)):
+        neighbors, scores = table.lookup(position)
+        expected = -np.sort(-cosine[position])[: similar.TOP_K]
+        expected = expected[expected > 0]
+        # Ties may pick either movie, but each must score what it is listed at.
+        np.testing.assert_allclose(scores, expected, rtol=1e-5)
+        np.testing.assert_allclose(cosine[position, neighbors], scores, rtol=1e-5)
+        assert position not in neighbors
@@ -0,0 +1,32 @@
+import numpy as np
+
+from hw2.skyline import skyline_layers
+
+
+def _peeled_layers(x, y, layers):
+    """Pareto layers by brute force: peel off the undominated points."""
+    result = np.full(len(x), -1)
+    remaining = np.arange(len(x))
+    for layer in range(layers):
+        rx, ry = x[remaining], y[remaining]
+        beaten = (rx[None, :] >= rx[:, None]) & (ry[None, :] >= ry[:, None])
+        beaten &= (rx[None, :] > rx[:, None]) | (ry[None, :] > ry[:, None])
+        front = ~beaten.any(axis=1)
+        result[remaining[front]] = layer
+        remaining = remaining[~front]
+    return result
+
+
+def test_layers_match_brute_force():
+    rng = np.random.default_rng(0)
+    # Few distinct values, so ties and duplicate points are common.
+    x = rng.integers(0, 30, 400).astype(np.float32)
+    y = rng.integers(0, 30, 400).astype(np.float32)
+    for layers in (1, 3, 50):
+        assert list(skyline_layers(x, y, layers)) == list(_peeled_layers(x, y, layers))
+
+
+def test_no_layers():
+    x = np.array([1.0, 2.0])
+    assert list(skyline_layers(x, x, 0)) == [-1, -1]
+    assert len(skyline_layers(x[:0], x[:0], 3)) == 0
@@ -0,0 +1,39 @@
+"""Copy the pinned chart libraries into vendor/ with content-hashed names.
+
+A required step when building a deployment (it needs network access): the
+app refuses to start while a library is missing here, and then serves them
+itself and never contacts a CDN.
+"""
+
+import json
+import os
+import urllib.request
+
+from assets import LIBRARIES, MANIFEST_PATH, VENDOR_DIR, hashed_name
+
+
+def main() -> None:
+    os.makedirs(VENDOR_DIR, exist_ok=True)
+    manifest: dict[str, str] = {}
+    for name, url in LIBRARIES.items():
+        with urllib.request.urlopen(url) as response:
+            content = response.read()
+        file_name = hashed_name(url, content)
+        with open(os.path.join(VENDOR_DIR, file_name), "wb") as f:
+            f.write(content)
+        manifest[name] = file_name
+        print(f"{name}: {file_name} ({len(content):,} bytes)")
+
+    # Drop files from earlier versions so the directory only holds live assets.
+    keep = set(manifest.values()) | {os.path.basename(MANIFEST_PATH)}
+    for file_name in os.listdir(VENDOR_DIR):
+        if file_name not in keep:
+            os.remove(os.path.join(VENDOR_DIR, file_name))
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import importlib
+from typing import Callable
+
+# View name -> (module, render function). Modules are imported only the first
+# time their view is selected, so a cold process that opens the hypercube never
+# pays for pandas or kagglehub.
+VIEWS = {
+    "Showing Data": ("hw2.showing_data", "render_hw2"),
+    "Interactive Hypercube": ("hw3.hypercube", "render_hw3"),
+    "Human Impact": ("hw4.human_impact", "render_hw4"),
+}
+
+
+def load_view(name: str) -> Callable[[], None]:
+    module_name, func_name = VIEWS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, func_name)